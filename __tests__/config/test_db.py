@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import app
+from config import db
+
+
+client = TestClient(app)
+
+
+def test_pool_is_not_opened_on_import():
+    assert db.pool.closed
+    assert db.async_pool.closed
+
+
+def test_pool_stats_derived_fields():
+    raw = {
+        "pool_min": 4,
+        "pool_max": 8,
+        "pool_size": 6,
+        "pool_available": 2,
+        "requests_num": 4,
+        "requests_wait_ms": 10,
+    }
+
+    with patch.object(db.pool, "get_stats", return_value=dict(raw)):
+        result = db.pool_stats()
+
+    assert result["connections_in_use"] == 4
+    assert result["requests_wait_avg_ms"] == 2.5
+    assert result["pool_max"] == 8
+
+
+def test_pool_stats_without_requests():
+    with patch.object(db.pool, "get_stats", return_value={"pool_size": 0, "pool_available": 0}):
+        result = db.pool_stats()
+
+    assert result["connections_in_use"] == 0
+    assert result["requests_wait_avg_ms"] == 0
+
+
+def test_stats_endpoint_exposes_pool():
+    with patch.object(db.pool, "get_stats", return_value={"pool_size": 3, "pool_available": 1}):
+        res = client.get("/api/stats")
+
+    assert res.status_code == 200
+    assert res.json()["pool"]["connections_in_use"] == 2
@@ -0,0 +1,106 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from controllers.async_auth_controller import router as auth_router
+from controllers.async_post_controller import router as post_router
+from controllers.async_user_controller import router as user_router
+from dependencies.auth import get_current_user, TokenPayload
+
+
+app = FastAPI()
+app.include_router(auth_router, prefix="/api")
+app.include_router(user_router, prefix="/api")
+app.include_router(post_router, prefix="/api")
+app.dependency_overrides[get_current_user] = lambda: TokenPayload(sub=1, exp=0)
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def mock_user_dto():
+    return {
+        "id": 1,
+        "user_name": "test_user",
+        "first_name": "John",
+        "last_name": "Doe",
+        "status": 1
+    }
+
+
+def test_login_success():
+    tokens = {"access_token": "access", "refresh_token": "refresh"}
+    login_data = {"user_name": "test_user", "password": "test123!"}
+
+    with patch("controllers.async_auth_controller.login_service", new=AsyncMock(return_value=tokens)) as mock:
+        response = client.post("/api/auth/login", json=login_data)
+
+    assert response.status_code == 200
+    assert response.json() == tokens
+    mock.assert_awaited_once_with(login_data)
+
+
+def test_login_failure():
+    login_data = {"user_name": "test_user", "password": "invalid123!"}
+
+    with patch("controllers.async_auth_controller.login_service",
+               new=AsyncMock(side_effect=ValueError("Wrong password"))):
+        response = client.post("/api/auth/login", json=login_data)
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Wrong password"}
+
+
+def test_get_user_by_id_success(mock_user_dto):
+    with patch("controllers.async_user_controller.get_user_by_id", new=AsyncMock(return_value=mock_user_dto)):
+        res = client.get("/api/users/1")
+
+    assert res.status_code == 200
+    assert res.json() == mock_user_dto
+
+
+def test_get_user_by_id_not_found():
+    with patch("controllers.async_user_controller.get_user_by_id",
+               new=AsyncMock(side_effect=ValueError("Not found"))):
+        res = client.get("/api/users/2")
+
+    assert res.status_code == 404
+
+
+def test_get_all_posts_success():
+    with patch("controllers.async_post_controller.get_all_posts", new=AsyncMock(return_value=[])) as mock:
+        res = client.get("/api/posts?limit=10&offset=0")
+
+    assert res.status_code == 200
+    assert res.json() == []
+    assert mock.call_args[0][0]["user_id"] == 1
+
+
+def test_like_post_not_found():
+    with patch("controllers.async_post_controller.like_post",
+               new=AsyncMock(side_effect=ValueError("Post not found"))):
+        res = client.post("/api/posts/5/like")
+
+    assert res.status_code == 404
+    assert res.json() == {"detail": "Post not found"}
+
+
+def test_get_users_batch_success(mock_user_dto):
+    batch = {"users": [mock_user_dto], "missing": [7]}
+    with patch("controllers.async_user_controller.get_users_by_ids", new=AsyncMock(return_value=batch)) as mock:
+        res = client.get("/api/users/batch", params={"ids": "1,7"})
+
+    assert res.status_code == 200
+    assert res.json() == batch
+    mock.assert_awaited_once_with([1, 7])
+
+
+def test_get_posts_batch_success():
+    batch = {"posts": [], "missing": [4]}
+    with patch("controllers.async_post_controller.get_posts_by_ids", new=AsyncMock(return_value=batch)) as mock:
+        res = client.get("/api/posts/batch", params={"ids": "4"})
+
+    assert res.status_code == 200
+    assert res.json() == batch
+    mock.assert_awaited_once_with([4], 1)
@@ -3,6 +3,7 @@ import pytest
 from unittest.mock import patch
 
 from app import app
+from utils.hashing import HashingOverloadedError
 
 
 client = TestClient(app)
@@ -68,3 +69,14 @@ def test_register_failure():
     assert response.status_code == 401
     assert response.json() == {"detail": "User already exists"}
     mock_register.assert_called_once_with(register_data)
+
+
+def test_login_overloaded():
+    login_data = {"user_name": "test_user", "password": "test123!"}
+
+    with patch("controllers.auth_controller.login_service",
+               side_effect=HashingOverloadedError("Too many authentication requests, try again later")):
+        response = client.post("/api/auth/login", json=login_data)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
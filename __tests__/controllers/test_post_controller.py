@@ -0,0 +1,105 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+import pytest
+from unittest.mock import patch
+
+from app import app
+from dependencies.auth import get_current_user, TokenPayload
+from utils.pagination import decode_cursor, encode_cursor
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def current_user():
+    app.dependency_overrides[get_current_user] = lambda: TokenPayload(sub=1, exp=0)
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def mock_posts():
+    return [
+        {
+            "id": post_id,
+            "text": f"Post {post_id}",
+            "reply_to_id": None,
+            "created_at": datetime(2025, 4, 24, 20, 55, post_id),
+            "likes_count": 0,
+            "views_count": 0,
+            "replies_count": 0,
+            "user_liked": False,
+            "user_viewed": False,
+            "user": {"id": 1, "user_name": "username", "first_name": "first", "last_name": "last"},
+        }
+        for post_id in (2, 1)
+    ]
+
+
+def test_get_all_posts_offset_mode(mock_posts):
+    with patch("controllers.post_controller.get_all_posts", return_value=mock_posts) as mock:
+        res = client.get("/api/posts?limit=10&offset=20")
+
+    assert res.status_code == 200
+    assert len(res.json()) == 2
+    assert "X-Next-Cursor" not in res.headers
+    assert mock.call_args[0][0]["offset"] == 20
+    assert mock.call_args[0][0]["cursor"] is None
+
+
+def test_get_all_posts_returns_next_cursor(mock_posts):
+    cursor = encode_cursor(datetime(2025, 4, 24, 20, 55, 3), 3)
+
+    with patch("controllers.post_controller.get_all_posts", return_value=mock_posts) as mock:
+        res = client.get(f"/api/posts?limit=2&cursor={cursor}")
+
+    assert res.status_code == 200
+    assert mock.call_args[0][0]["cursor"] == cursor
+    assert decode_cursor(res.headers["X-Next-Cursor"]) == (mock_posts[-1]["created_at"], 1)
+
+
+def test_get_all_posts_invalid_cursor():
+    with patch("controllers.post_controller.get_all_posts", side_effect=ValueError("Invalid cursor")):
+        res = client.get("/api/posts?cursor=broken")
+
+    assert res.status_code == 400
+    assert res.json() == {"detail": "Invalid cursor"}
+
+
+def test_view_posts_batch():
+    with patch("controllers.post_controller.view_posts", return_value=[1, 3]) as mock:
+        res = client.post("/api/posts/views", json={"post_ids": [1, 2, 3]})
+
+    assert res.status_code == 200
+    assert res.json() == {"viewed": [1, 3]}
+    mock.assert_called_once_with([1, 2, 3], 1)
+
+
+@pytest.mark.parametrize("post_ids", [[], [0], list(range(1, 102))])
+def test_view_posts_batch_validation(post_ids):
+    with patch("controllers.post_controller.view_posts") as mock:
+        res = client.post("/api/posts/views", json={"post_ids": post_ids})
+
+    assert res.status_code == 422
+    mock.assert_not_called()
+
+
+def test_get_posts_batch_success(mock_posts):
+    with patch("controllers.post_controller.get_posts_by_ids",
+               return_value={"posts": mock_posts, "missing": [5]}) as mock:
+        res = client.get("/api/posts/batch", params={"ids": "2,5,1"})
+
+    assert res.status_code == 200
+    assert [post["id"] for post in res.json()["posts"]] == [2, 1]
+    assert res.json()["missing"] == [5]
+    mock.assert_called_once_with([2, 5, 1], 1)
+
+
+def test_get_posts_batch_invalid_ids():
+    with patch("controllers.post_controller.get_posts_by_ids") as mock:
+        res = client.get("/api/posts/batch", params={"ids": "1,x"})
+
+    assert res.status_code == 400
+    mock.assert_not_called()
@@ -43,12 +43,53 @@ def test_get_all_users_success(mock_token_header, mock_user_dto):
         assert res.json() == users
 
 
+def test_get_all_users_sets_next_cursor_and_estimate(mock_token_header, mock_user_dto):
+    from utils.pagination import decode_id_cursor
+
+    with patch("controllers.user_controller.get_all_users", return_value=[mock_user_dto]) as mock, \
+         patch("controllers.user_controller.estimate_users_count", return_value=1234):
+        res = client.get("/api/users?limit=1&cursor=abc&with_total=true", headers=mock_token_header)
+        assert res.status_code == 200
+        assert decode_id_cursor(res.headers["x-next-cursor"]) == mock_user_dto["id"]
+        assert res.headers["x-total-count-estimate"] == "1234"
+        mock.assert_called_once_with(1, 0, "abc")
+
+
+def test_get_all_users_last_page_has_no_cursor(mock_token_header, mock_user_dto):
+    with patch("controllers.user_controller.get_all_users", return_value=[mock_user_dto]), \
+         patch("controllers.user_controller.estimate_users_count") as estimate:
+        res = client.get("/api/users?limit=10", headers=mock_token_header)
+        assert "x-next-cursor" not in res.headers
+        assert "x-total-count-estimate" not in res.headers
+        estimate.assert_not_called()
+
+
+def test_get_all_users_keeps_response_schema():
+    schema = app.openapi()["paths"]["/api/users/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["items"] == {"$ref": "#/components/schemas/ReadUserDTO"}
+
+
 def test_get_all_users_failure(mock_token_header):
     with patch("controllers.user_controller.get_all_users", side_effect=Exception("Service error")):
         res = client.get("/api/users?limit=10&offset=0", headers=mock_token_header)
         assert res.status_code == 400
 
 
+def test_get_users_batch_success(mock_token_header, mock_user_dto):
+    batch = {"users": [mock_user_dto], "missing": [7]}
+    with patch("controllers.user_controller.get_users_by_ids", return_value=batch) as mock:
+        res = client.get("/api/users/batch?ids=1,7", headers=mock_token_header)
+        assert res.status_code == 200
+        assert res.json() == batch
+        mock.assert_called_once_with([1, 7])
+
+
+def test_get_users_batch_invalid_ids(mock_token_header):
+    res = client.get("/api/users/batch?ids=1,-2", headers=mock_token_header)
+    assert res.status_code == 400
+    assert res.json() == {"detail": "ids must be positive"}
+
+
 def test_get_user_by_id_success(mock_token_header, mock_user_dto):
     with patch("controllers.user_controller.get_user_by_id", return_value=mock_user_dto):
         res = client.get("/api/users/1", headers=mock_token_header)
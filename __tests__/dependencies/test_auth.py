@@ -0,0 +1,93 @@
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError
+
+from dependencies import auth
+
+
+SECRET = "test_secret"
+
+
+@pytest.fixture(autouse=True)
+def jwt_settings():
+    auth.token_cache.clear()
+    with patch("dependencies.auth.ACCESS_TOKEN_SECRET", SECRET), patch("dependencies.auth.ALGORITHM", "HS256"):
+        yield
+    auth.token_cache.clear()
+
+
+def make_request(token: str) -> MagicMock:
+    request = MagicMock()
+    request.headers = {"Authorization": f"Bearer {token}"}
+    return request
+
+
+def make_token(exp: int) -> str:
+    return jwt.encode({"sub": "1", "exp": exp}, SECRET, algorithm="HS256")
+
+
+def test_get_current_user_decodes_token():
+    exp = int(time.time()) + 3600
+
+    user = asyncio.run(auth.get_current_user(make_request(make_token(exp))))
+
+    assert user.sub == 1
+    assert user.exp == exp
+
+
+def test_get_current_user_caches_verified_token():
+    token = make_token(int(time.time()) + 3600)
+    hits = auth.token_cache.stats()["hits"]
+
+    first = asyncio.run(auth.get_current_user(make_request(token)))
+    with patch("dependencies.auth.jwt.decode") as mock_decode:
+        second = asyncio.run(auth.get_current_user(make_request(token)))
+
+    mock_decode.assert_not_called()
+    assert second == first
+    assert auth.token_cache.stats()["hits"] == hits + 1
+
+
+def test_cached_token_not_served_after_exp():
+    token = make_token(int(time.time()) + 2)
+    asyncio.run(auth.get_current_user(make_request(token)))
+
+    with (
+        patch("utils.cache.time.monotonic", return_value=time.monotonic() + 3),
+        patch("dependencies.auth.jwt.decode", side_effect=ExpiredSignatureError("Signature has expired.")),
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(auth.get_current_user(make_request(token)))
+
+    assert exc_info.value.status_code == 401
+
+
+def test_invalid_token_is_not_cached():
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(auth.get_current_user(make_request("broken")))
+
+    assert exc_info.value.status_code == 401
+    assert auth.token_cache.stats()["size"] == 0
+
+
+def test_missing_token():
+    request = MagicMock()
+    request.headers = {}
+
+    with pytest.raises(HTTPException, match="Missing token"):
+        asyncio.run(auth.get_current_user(request))
+
+
+def test_verify_same_user_rejects_other_user():
+    token = auth.TokenPayload(sub=1, exp=0)
+
+    assert asyncio.run(auth.verify_same_user(1, token)) is token
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(auth.verify_same_user(2, token))
+
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,236 @@
+"""Регрессионные бюджеты производительности на засеянной локальной базе.
+
+Запуск: PERF_TESTS=1 pytest __tests__/perf (база: scripts.migrate + scripts.seed с параметрами по умолчанию).
+Запись нового baseline латентности: PERF_TESTS=1 PERF_UPDATE_BASELINE=1 pytest __tests__/perf
+"""
+import difflib
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+import psycopg
+import pytest
+
+from utils.tracing import is_read
+
+
+HERE = Path(__file__).parent
+BUDGETS = json.loads((HERE / "budgets.json").read_text())
+BASELINE_PATH = HERE / "baseline.json"
+ITERATIONS = int(os.getenv("PERF_ITERATIONS", "20"))
+UPDATE_BASELINE = os.getenv("PERF_UPDATE_BASELINE") == "1"
+PASSWORD = os.getenv("PERF_PASSWORD", "Passw0rd!")
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(str(sql).split())
+
+
+def rows_examined(plan: dict) -> int:
+    """Строки, прочитанные узлами сканирования (включая отброшенные фильтром), по всему дереву плана."""
+    total = 0
+    if "Scan" in plan.get("Node Type", ""):
+        loops = plan.get("Actual Loops", 1)
+        total += (plan.get("Actual Rows", 0) + plan.get("Rows Removed by Filter", 0)
+                  + plan.get("Rows Removed by Index Recheck", 0)) * loops
+    for child in plan.get("Plans", []):
+        total += rows_examined(child)
+    return int(total)
+
+
+def shared_buffers(plan: dict) -> int:
+    # у корневого узла счётчики буферов накопительные
+    return plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+
+
+def budget_report(name: str, budget: dict, actual: dict, baseline: dict | None, tolerance: float) -> list[str]:
+    """Пустой список - бюджет соблюдён, иначе читаемое описание нарушения."""
+    lines = [f"{'metric':<18} {'budget':>10} {'actual':>10}"]
+    failed = False
+    for metric in ("statements", "rows_examined", "shared_buffers"):
+        status = "ok" if actual[metric] <= budget[metric] else "FAIL"
+        failed |= status == "FAIL"
+        lines.append(f"{metric:<18} {budget[metric]:>10} {actual[metric]:>10}  {status}")
+
+    if baseline and baseline.get("p50_ms"):
+        limit = baseline["p50_ms"] * tolerance
+        status = "ok" if actual["p50_ms"] <= limit else "FAIL"
+        failed |= status == "FAIL"
+        lines.append(f"{f'p50_ms (x{tolerance})':<18} {limit:>10.2f} {actual['p50_ms']:>10.2f}  {status}"
+                     f"  baseline {baseline['p50_ms']:.2f}")
+
+    if not failed:
+        return []
+    if baseline and baseline.get("statements") != actual["statements_sql"]:
+        lines.append("statements (- baseline, + actual):")
+        lines.extend(f"  {line}" for line in difflib.unified_diff(
+            baseline.get("statements", []), actual["statements_sql"], lineterm="", n=0,
+        ) if not line.startswith(("---", "+++", "@@")))
+    return [f"{name}: performance budget exceeded"] + lines
+
+
+@pytest.fixture(scope="module")
+def perf_db():
+    if os.getenv("PERF_TESTS") != "1":
+        pytest.skip("set PERF_TESTS=1 to run performance budgets against a seeded database")
+    from config.db import conninfo
+    try:
+        conn = psycopg.connect(conninfo, connect_timeout=3, autocommit=True)
+    except psycopg.OperationalError as e:
+        pytest.skip(f"database is not available: {e}")
+    with conn:
+        if not conn.execute("SELECT EXISTS (SELECT 1 FROM posts)").fetchone()[0]:
+            pytest.skip("database is empty: run scripts.seed first")
+        yield conn
+
+
+@pytest.fixture(scope="module")
+def captured_statements():
+    """Все запросы, выполненные приложением через psycopg.Cursor."""
+    captured = []
+    original = psycopg.Cursor.execute
+
+    def execute(self, query, params=None, **kwargs):
+        captured.append((query, params))
+        return original(self, query, params, **kwargs)
+
+    psycopg.Cursor.execute = execute
+    yield captured
+    psycopg.Cursor.execute = original
+
+
+@pytest.fixture(scope="module")
+def client(perf_db, captured_statements):
+    from fastapi.testclient import TestClient
+
+    from app import app
+
+    with TestClient(app) as test_client:
+        user_name = perf_db.execute("SELECT user_name FROM users WHERE deleted_at IS NULL ORDER BY id LIMIT 1").fetchone()[0]
+        res = test_client.post("/api/auth/login", json={"user_name": user_name, "password": PASSWORD})
+        assert res.status_code == 200, f"login as {user_name} failed, check PERF_PASSWORD: {res.text}"
+        test_client.headers["Authorization"] = f"Bearer {res.json()['access_token']}"
+        test_client.user_name = user_name
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def scenarios(perf_db, client):
+    thread_id = perf_db.execute(
+        "SELECT id FROM posts WHERE deleted_at IS NULL ORDER BY replies_count DESC LIMIT 1"
+    ).fetchone()[0]
+    # пост без лайка этого пользователя: like/unlike не упрётся в "already liked"
+    post_id = perf_db.execute(
+        """
+        SELECT p.id FROM posts p JOIN users u ON u.user_name = %s
+        WHERE p.deleted_at IS NULL
+          AND NOT EXISTS (SELECT 1 FROM likes l WHERE l.post_id = p.id AND l.user_id = u.id)
+        ORDER BY p.id DESC LIMIT 1
+        """,
+        (client.user_name,),
+    ).fetchone()[0]
+
+    def like_unlike():
+        client.post(f"/api/posts/{post_id}/like").raise_for_status()
+        client.delete(f"/api/posts/{post_id}/like").raise_for_status()
+
+    return {
+        "feed_page_1": lambda: client.get("/api/posts/", params={"limit": 10}).raise_for_status(),
+        "feed_page_n": lambda: client.get("/api/posts/", params={"limit": 10, "offset": 500}).raise_for_status(),
+        "thread": lambda: client.get("/api/posts/", params={"limit": 10, "reply_to_id": thread_id}).raise_for_status(),
+        "search": lambda: client.get("/api/posts/", params={"limit": 10, "search": "lorem"}).raise_for_status(),
+        "like_unlike": like_unlike,
+        "login": lambda: client.post(
+            "/api/auth/login", json={"user_name": client.user_name, "password": PASSWORD}
+        ).raise_for_status(),
+    }
+
+
+def measure(perf_db, captured_statements, scenario) -> dict:
+    from services.feed_cache import feed_cache
+
+    # кэш ленты сбрасывается: бюджет описывает путь до базы
+    feed_cache.clear()
+    captured_statements.clear()
+    scenario()
+    statements = list(captured_statements)
+
+    examined = buffers = 0
+    for query, params in statements:
+        if is_read(normalize_sql(query)):
+            plan = perf_db.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params).fetchone()[0][0]["Plan"]
+            examined += rows_examined(plan)
+            buffers += shared_buffers(plan)
+
+    timings = []
+    for _ in range(ITERATIONS):
+        feed_cache.clear()
+        started = time.perf_counter()
+        scenario()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "statements": len(statements),
+        "statements_sql": [normalize_sql(query)[:120] for query, _ in statements],
+        "rows_examined": examined,
+        "shared_buffers": buffers,
+        "p50_ms": statistics.median(timings),
+    }
+
+
+@pytest.mark.parametrize("name", list(BUDGETS["scenarios"]))
+def test_performance_budget(name, perf_db, captured_statements, scenarios):
+    actual = measure(perf_db, captured_statements, scenarios[name])
+    # baseline латентности машинно-зависим: без файла сравнение с ним пропускается
+    baseline_data = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {"scenarios": {}}
+
+    if UPDATE_BASELINE:
+        baseline_data["scenarios"][name] = {"p50_ms": round(actual["p50_ms"], 3),
+                                            "statements": actual["statements_sql"]}
+        BASELINE_PATH.write_text(json.dumps(baseline_data, indent=2, ensure_ascii=False) + "\n")
+
+    report = budget_report(name, BUDGETS["scenarios"][name], actual,
+                           baseline_data["scenarios"].get(name), BUDGETS["latency_tolerance"])
+    assert not report, "\n".join(report)
+
+
+def test_budget_report_shows_readable_diff():
+    actual = {"statements": 2, "rows_examined": 50, "shared_buffers": 10, "p50_ms": 9.0,
+              "statements_sql": ["SELECT p.id FROM posts p", "SELECT 1 FROM likes"]}
+    baseline = {"p50_ms": 4.0, "statements": ["SELECT p.id FROM posts p"]}
+
+    report = budget_report("feed_page_1", {"statements": 1, "rows_examined": 200, "shared_buffers": 300},
+                           actual, baseline, 1.5)
+
+    text = "\n".join(report)
+    assert report[0] == "feed_page_1: performance budget exceeded"
+    assert "statements                  1          2  FAIL" in text
+    assert "rows_examined             200         50  ok" in text
+    assert "p50_ms (x1.5)            6.00       9.00  FAIL  baseline 4.00" in text
+    assert "  +SELECT 1 FROM likes" in text
+
+
+def test_budget_report_passes_within_budget():
+    actual = {"statements": 1, "rows_examined": 50, "shared_buffers": 10, "p50_ms": 5.0, "statements_sql": []}
+    assert budget_report("thread", {"statements": 1, "rows_examined": 200, "shared_buffers": 300},
+                         actual, {"p50_ms": 4.0, "statements": []}, 1.5) == []
+
+
+def test_rows_examined_counts_filtered_rows_and_loops():
+    plan = {
+        "Node Type": "Nested Loop", "Shared Hit Blocks": 7, "Shared Read Blocks": 3,
+        "Plans": [
+            {"Node Type": "Index Scan", "Actual Rows": 10, "Actual Loops": 1, "Rows Removed by Filter": 5},
+            {"Node Type": "Index Only Scan", "Actual Rows": 1, "Actual Loops": 10},
+        ],
+    }
+    assert rows_examined(plan) == 25
+    assert shared_buffers(plan) == 10
+
+
+def test_is_read():
+    assert is_read("SELECT 1")
+    assert is_read("WITH page AS (SELECT 1) SELECT * FROM page")
+    assert not is_read("WITH liked AS (INSERT INTO likes VALUES (1, 2) RETURNING post_id) UPDATE posts SET x = 1")
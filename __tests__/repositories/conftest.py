@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def _serve_rows(cursor_factory: MagicMock, mock_cursor: MagicMock, rows: list[dict]) -> None:
+    """conn.cursor(row_factory=...) применяет фабрику к строкам-кортежам, как psycopg."""
+    mock_cursor.description = [SimpleNamespace(name=name) for name in rows[0]]
+
+    def open_cursor(row_factory=None):
+        make_row = row_factory(mock_cursor)
+        mock_cursor.fetchall.return_value = [make_row(tuple(row.values())) for row in rows]
+        mock_cursor.fetchone.return_value = make_row(tuple(rows[0].values()))
+        return cursor_factory.return_value
+
+    cursor_factory.side_effect = open_cursor
+
+
+@pytest.fixture
+def serve_rows():
+    return _serve_rows
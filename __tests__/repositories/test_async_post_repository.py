@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from psycopg.errors import UniqueViolation
+
+from repositories.async_post_repository import (create_post, delete_post,
+                                                dislike_post, get_all_posts,
+                                                get_post_by_id, get_posts_by_ids,
+                                                like_post, view_post)
+from repositories.post_queries import FEED_START
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.lower().split())
+
+
+@pytest.fixture
+def mock_cursor():
+    with patch("config.db.async_pool.connection") as mock_conn_context:
+        cursor = AsyncMock()
+        mock_conn_context.return_value.__aenter__.return_value.cursor = MagicMock()
+        mock_conn_context.return_value.__aenter__.return_value.cursor.return_value.__aenter__.return_value = cursor
+        yield cursor
+
+
+def test_create_post_success(mock_cursor):
+    dto = {"text": "Lorem ipsum dolor sit amet", "user_id": 1, "reply_to_id": None}
+    expected = {"id": 1, "text": dto["text"], "created_at": datetime.now(), "reply_to_id": None}
+    mock_cursor.fetchone.return_value = expected
+
+    assert asyncio.run(create_post(dto)) == expected
+
+    assert "insert into posts" in normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert mock_cursor.execute.call_args[0][1] == (dto["text"], dto["user_id"], dto["reply_to_id"])
+
+
+def test_get_all_posts_success(mock_cursor, serve_rows):
+    now = datetime(2025, 4, 24, 20, 55, 53)
+    dto = {"user_id": 1, "owner_id": 0, "limit": 10, "offset": 0, "reply_to_id": None, "search": ""}
+    rows = [
+        {
+            "id": 1,
+            "text": "Post 1",
+            "reply_to_id": None,
+            "created_at": now,
+            "likes_count": 10,
+            "views_count": 100,
+            "replies_count": 0,
+            "user_liked": True,
+            "user_viewed": False,
+            "user_id": 1,
+            "user_name": "username",
+            "first_name": "first",
+            "last_name": "last",
+        },
+    ]
+    with patch("config.db.async_pool.connection") as mock_conn_context:
+        cursor_factory = mock_conn_context.return_value.__aenter__.return_value.cursor = MagicMock()
+        cursor_factory.return_value.__aenter__.return_value = mock_cursor
+        serve_rows(cursor_factory, mock_cursor, rows)
+        result = asyncio.run(get_all_posts(dto))
+
+    assert result == [
+        {
+            "id": 1,
+            "text": "Post 1",
+            "reply_to_id": None,
+            "created_at": now,
+            "likes_count": 10,
+            "views_count": 100,
+            "replies_count": 0,
+            "user_liked": True,
+            "user_viewed": False,
+            "user": {"id": 1, "user_name": "username", "first_name": "first", "last_name": "last"},
+        },
+    ]
+    assert mock_cursor.execute.call_args[0][1] == [1, 1, *FEED_START, 0, 10]
+
+
+def test_get_post_by_id_not_found(mock_cursor):
+    mock_cursor.fetchone.return_value = None
+
+    with pytest.raises(ValueError, match="Post not found"):
+        asyncio.run(get_post_by_id(999, 1))
+
+    assert mock_cursor.execute.call_args[0][1] == (1, 1, 999)
+
+
+def test_delete_post_not_found(mock_cursor):
+    mock_cursor.rowcount = 0
+
+    with pytest.raises(ValueError, match="Post not found or already deleted"):
+        asyncio.run(delete_post(2, 1))
+
+
+def test_view_post_already_viewed(mock_cursor):
+    mock_cursor.execute.side_effect = UniqueViolation(
+        'duplicate key value violates unique constraint "views_user_id_post_id_pkey"'
+    )
+
+    with pytest.raises(ValueError, match="Post already viewed"):
+        asyncio.run(view_post(3, 1))
+
+
+def test_like_post_already_liked(mock_cursor):
+    mock_cursor.execute.side_effect = UniqueViolation(
+        'duplicate key value violates unique constraint "likes_user_id_post_id_pkey"'
+    )
+
+    with pytest.raises(ValueError, match="Post already liked"):
+        asyncio.run(like_post(3, 1))
+
+
+def test_dislike_post_success(mock_cursor):
+    mock_cursor.rowcount = 1
+
+    assert asyncio.run(dislike_post(1, 1)) is None
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "delete from likes where post_id = %s and user_id = %s" in normalized_sql
+    assert mock_cursor.execute.call_args[0][1] == (1, 1)
+
+
+def test_get_posts_by_ids_keeps_request_order(serve_rows):
+    now = datetime.now()
+    rows = [
+        {"post_id": post_id, "text": f"Post {post_id}", "reply_to_id": None, "created_at": now,
+         "user_id": 1, "user_name": "username", "first_name": None, "last_name": None,
+         "likes_count": 0, "views_count": 0, "replies_count": 0, "user_liked": False, "user_viewed": True}
+        for post_id in (1, 3)
+    ]
+
+    with patch("config.db.async_pool.connection") as mock_conn_context:
+        mock_cursor = AsyncMock()
+        cursor_factory = mock_conn_context.return_value.__aenter__.return_value.cursor = MagicMock()
+        cursor_factory.return_value.__aenter__.return_value = mock_cursor
+        serve_rows(cursor_factory, mock_cursor, rows)
+        result = asyncio.run(get_posts_by_ids([3, 1], 7))
+
+    assert [post["id"] for post in result] == [3, 1]
+    assert mock_cursor.execute.call_args[0][1] == (7, 7, [3, 1])
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, UTC
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from repositories.async_user_repository import (
+    create_user,
+    get_all_users,
+    get_user_by_id,
+    get_user_by_username,
+    get_users_by_ids,
+    update_user,
+    delete_user,
+    estimate_users_count,
+)
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.lower().split())
+
+
+@pytest.fixture
+def mock_cursor():
+    with patch("config.db.async_pool.connection") as mock_conn_context:
+        cursor = AsyncMock()
+        mock_conn_context.return_value.__aenter__.return_value.cursor = MagicMock()
+        mock_conn_context.return_value.__aenter__.return_value.cursor.return_value.__aenter__.return_value = cursor
+        yield cursor
+
+
+def test_create_user_success(mock_cursor):
+    dto = {"user_name": "john", "first_name": "John", "last_name": "Doe", "password_hash": "password"}
+    expected = {"id": 1, "user_name": "john", "password_hash": "password", "status": 1}
+    mock_cursor.fetchone.return_value = expected
+
+    assert asyncio.run(create_user(dto)) == expected
+    assert mock_cursor.execute.call_args[0][1] == ("john", "John", "Doe", "password")
+
+
+def test_get_all_users_success(mock_cursor):
+    now = datetime.now(UTC)
+    expected = [{"id": 1, "user_name": "john", "first_name": "John", "last_name": "Doe",
+                 "status": 1, "created_at": now, "updated_at": now}]
+    mock_cursor.fetchall.return_value = expected
+
+    assert asyncio.run(get_all_users(limit=100, offset=0)) == expected
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "from users where deleted_at is null" in normalized_sql
+    assert mock_cursor.execute.call_args[0][1] == (0, 100)
+
+
+def test_get_user_by_id_not_found(mock_cursor):
+    mock_cursor.fetchone.return_value = None
+
+    with pytest.raises(ValueError, match="User not found"):
+        asyncio.run(get_user_by_id(999))
+
+
+def test_get_user_by_username_not_found(mock_cursor):
+    mock_cursor.fetchone.return_value = None
+
+    with pytest.raises(ValueError, match="User not found"):
+        asyncio.run(get_user_by_username("notfound"))
+
+
+def test_update_user_no_fields(mock_cursor):
+    with pytest.raises(ValueError, match="No fields to update"):
+        asyncio.run(update_user(1, {}))
+
+    mock_cursor.execute.assert_not_called()
+
+
+def test_delete_user_not_found(mock_cursor):
+    mock_cursor.rowcount = 0
+
+    with pytest.raises(ValueError, match="User not found"):
+        asyncio.run(delete_user(2))
+
+
+def test_get_users_by_ids_keeps_request_order(mock_cursor):
+    mock_cursor.fetchall.return_value = [{"id": 1, "user_name": "john"}, {"id": 2, "user_name": "jane"}]
+
+    assert [user["id"] for user in asyncio.run(get_users_by_ids([2, 5, 1]))] == [2, 1]
+    assert mock_cursor.execute.call_args[0][1] == ([2, 5, 1],)
+
+
+def test_get_all_users_after_id_uses_keyset(mock_cursor):
+    mock_cursor.fetchall.return_value = []
+
+    asyncio.run(get_all_users(limit=10, offset=0, after_id=57))
+
+    assert "and id > %s order by id limit %s" in normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert mock_cursor.execute.call_args[0][1] == (57, 10)
+
+
+def test_estimate_users_count(mock_cursor):
+    mock_cursor.fetchone.return_value = (1234,)
+
+    assert asyncio.run(estimate_users_count()) == 1234
@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from repositories.post_queries import (FEED_QUERIES, FEED_START, THREAD_START, detailed_post_row,
+                                       get_all_posts_query, to_prefix_tsquery)
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.lower().split())
+
+
+@pytest.mark.parametrize(
+    "search, expected",
+    [
+        ("test", "test:*"),
+        ("Go  Lang", "go:* & lang:*"),
+        ("привет, мир!", "привет:* & мир:*"),
+        ("it's a_b", "it:* & s:* & a:* & b:*"),
+        ("' | & ! :*", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_to_prefix_tsquery(search, expected):
+    assert to_prefix_tsquery(search) == expected
+
+
+def test_search_uses_full_text_index():
+    dto = {"user_id": 1, "owner_id": 0, "limit": 10, "offset": 0, "reply_to_id": None, "search": "hello wor"}
+
+    query, params = get_all_posts_query(dto)
+
+    normalized = normalize_sql(query)
+    assert "p.text_tsv @@ to_tsquery('simple', %s)" in normalized
+    assert "ilike" not in normalized
+    assert params == [1, 1, "hello:* & wor:*", *FEED_START, 0, 10]
+
+
+def test_search_without_words_is_ignored():
+    dto = {"user_id": 1, "owner_id": 0, "limit": 10, "offset": 0, "reply_to_id": None, "search": "!!!"}
+
+    query, params = get_all_posts_query(dto)
+
+    assert "tsquery" not in query
+    assert params == [1, 1, *FEED_START, 0, 10]
+
+
+def test_feed_selects_page_ids_before_enrichment():
+    dto = {"user_id": 1, "owner_id": 2, "limit": 10, "offset": 20, "reply_to_id": None, "search": ""}
+
+    query, params = get_all_posts_query(dto)
+
+    normalized = normalize_sql(query)
+    page = normalized[normalized.index("from (") + len("from ("):normalized.index(") page")]
+    assert page == (
+        "select p.id from posts p where p.deleted_at is null and p.user_id = %s and p.reply_to_id is null "
+        "and (p.created_at, p.id) < (%s, %s) order by p.created_at desc, p.id desc offset %s limit %s"
+    )
+    assert "join users u on u.id = p.user_id" in normalized
+    assert normalized.endswith("order by p.created_at desc, p.id desc")
+    assert params == [1, 1, 2, *FEED_START, 20, 10]
+
+
+def test_detailed_post_row_maps_by_column_name():
+    from types import SimpleNamespace
+
+    columns = ["user_liked", "user_viewed", "post_id", "text", "reply_to_id", "created_at", "user_id",
+               "user_name", "first_name", "last_name", "likes_count", "views_count", "replies_count"]
+    cursor = SimpleNamespace(description=[SimpleNamespace(name=name) for name in columns])
+    make_row = detailed_post_row(cursor)
+
+    assert make_row((True, False, 7, "text", None, "now", 3, "user", "first", None, 1, 2, 0)) == {
+        "id": 7,
+        "text": "text",
+        "reply_to_id": None,
+        "created_at": "now",
+        "likes_count": 1,
+        "views_count": 2,
+        "replies_count": 0,
+        "user_liked": True,
+        "user_viewed": False,
+        "user": {"id": 3, "user_name": "user", "first_name": "first", "last_name": None},
+    }
+
+
+@pytest.mark.parametrize(
+    "dto",
+    [
+        {"offset": 0},
+        {"offset": 20},
+        {"offset": 0, "after": (datetime(2025, 4, 24, tzinfo=timezone.utc), 10)},
+        {"offset": 0, "search": "go"},
+        {"offset": 0, "owner_id": 3, "search": "go lang"},
+        {"offset": 0, "reply_to_id": 5},
+        {"offset": 0, "reply_to_id": 5, "after": (datetime(2025, 4, 24, tzinfo=timezone.utc), 10)},
+    ],
+)
+def test_feed_uses_fixed_query_texts(dto):
+    query, params = get_all_posts_query({"user_id": 1, "owner_id": 0, "limit": 10, "search": "", **dto})
+
+    assert any(query is text for text in FEED_QUERIES.values())
+    assert len(FEED_QUERIES) == 8
+    assert query.count("%s") == len(params)
+
+
+def test_feed_without_cursor_starts_from_open_bound():
+    _, feed_params = get_all_posts_query({"user_id": 1, "owner_id": 0, "limit": 10, "offset": 0, "search": ""})
+    _, thread_params = get_all_posts_query(
+        {"user_id": 1, "owner_id": 0, "limit": 10, "offset": 0, "search": "", "reply_to_id": 5}
+    )
+
+    assert feed_params == [1, 1, *FEED_START, 0, 10]
+    assert thread_params == [1, 1, 5, *THREAD_START, 0, 10]
@@ -6,7 +6,10 @@ from psycopg.errors import UniqueViolation
 
 from repositories.post_repository import (create_post, delete_post,
                                           dislike_post, get_all_posts,
-                                          get_post_by_id, like_post, view_post)
+                                          get_post_by_id, get_posts_by_ids,
+                                          like_post,
+                                          reconcile_counters, record_views,
+                                          view_post, view_posts)
 
 
 def normalize_sql(sql: str) -> str:
@@ -19,7 +22,6 @@ def mock_conn():
         yield mock_conn_context
 
 
-
 def test_create_post_success(mock_conn):
     dto = {
         "text": "Lorem ipsum dolor sit amet, consectetur adipiscing",
@@ -127,7 +129,7 @@ def test_create_post_error(mock_conn):
     assert params == (dto["text"], dto["user_id"], dto["reply_to_id"])
 
 
-def test_get_all_posts_success(mock_conn):
+def test_get_all_posts_success(mock_conn, serve_rows):
     now = datetime(2025, 4, 24, 20, 55, 53, 21000)
 
     dto = {
@@ -140,7 +142,7 @@ def test_get_all_posts_success(mock_conn):
     }
 
     mock_cursor = MagicMock()
-    mock_cursor.fetchall.return_value = [
+    rows = [
         {
             "id": 1,
             "text": "Post 1",
@@ -173,6 +175,7 @@ def test_get_all_posts_success(mock_conn):
         },
     ]
     mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+    serve_rows(mock_conn.return_value.__enter__.return_value.cursor, mock_cursor, rows)
 
     result = get_all_posts(dto)
 
@@ -246,7 +249,7 @@ def test_get_all_posts_error(mock_conn):
     assert params[0] == dto["user_id"]
 
 
-def test_get_post_by_id_success(mock_conn):
+def test_get_post_by_id_success(mock_conn, serve_rows):
     user_id = 1
     post_id = 1
     now = datetime.now(UTC)
@@ -268,8 +271,8 @@ def test_get_post_by_id_success(mock_conn):
     }
 
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = row
     mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+    serve_rows(mock_conn.return_value.__enter__.return_value.cursor, mock_cursor, [row])
 
     result = get_post_by_id(post_id, user_id)
 
@@ -504,4 +507,176 @@ def test_dislike_post_not_found(mock_conn):
     assert "delete from likes where post_id = %s and user_id = %s" in normalized_sql
 
     params = mock_cursor.execute.call_args[0][1]
-    assert params == (post_id, user_id)
\ No newline at end of file
+    assert params == (post_id, user_id)
+
+def test_get_all_posts_feed_cursor(mock_conn):
+    after = (datetime(2025, 4, 24, 20, 55, 53), 10)
+    dto = {
+        "user_id": 1,
+        "owner_id": 0,
+        "limit": 10,
+        "offset": 30,
+        "reply_to_id": None,
+        "search": "",
+        "after": after,
+    }
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = []
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    assert get_all_posts(dto) == []
+
+    normalized = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "(p.created_at, p.id) < (%s, %s)" in normalized
+    assert "order by p.created_at desc, p.id desc offset %s limit %s" in normalized
+
+    params = mock_cursor.execute.call_args[0][1]
+    assert params == [1, 1, *after, 0, 10]
+
+
+def test_get_all_posts_thread_cursor(mock_conn):
+    after = (datetime(2025, 4, 24, 20, 55, 53), 10)
+    dto = {
+        "user_id": 1,
+        "owner_id": 0,
+        "limit": 10,
+        "offset": 0,
+        "reply_to_id": 5,
+        "search": "",
+        "after": after,
+    }
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = []
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    get_all_posts(dto)
+
+    normalized = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "p.reply_to_id = %s and (p.created_at, p.id) > (%s, %s)" in normalized
+    assert "order by p.created_at asc, p.id asc offset %s limit %s" in normalized
+
+    params = mock_cursor.execute.call_args[0][1]
+    assert params == [1, 1, 5, *after, 0, 10]
+
+
+def test_like_post_increments_counter(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.rowcount = 1
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    like_post(1, 1)
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "update posts set likes_count = likes_count + 1" in normalized_sql
+
+
+def test_dislike_post_decrements_counter(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.rowcount = 1
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    dislike_post(1, 1)
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "update posts set likes_count = likes_count - 1" in normalized_sql
+
+
+def test_create_reply_increments_parent_counter(mock_conn):
+    mock_cursor = MagicMock()
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    create_post({"text": "Lorem ipsum", "user_id": 1, "reply_to_id": 5})
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "update posts set replies_count = replies_count + 1" in normalized_sql
+
+
+def test_delete_post_decrements_parent_counter(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.rowcount = 1
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    delete_post(1, 1)
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "update posts set replies_count = replies_count - 1" in normalized_sql
+
+
+def test_reconcile_counters(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.rowcount = 3
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    assert reconcile_counters() == 3
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "update posts p set likes_count = c.likes_count" in normalized_sql
+    assert "is distinct from" in normalized_sql
+
+
+def test_view_posts_batch(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [(3,), (1,)]
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    assert view_posts([1, 2, 3, 1], 7) == [1, 3]
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "insert into views (post_id, user_id) select p.id, %s" in normalized_sql
+    assert "p.id = any(%s)" in normalized_sql
+    assert "on conflict do nothing" in normalized_sql
+    assert "update posts set views_count = views_count + 1" in normalized_sql
+    assert mock_cursor.execute.call_count == 1
+
+    params = mock_cursor.execute.call_args[0][1]
+    assert params == (7, [1, 2, 3, 1])
+
+
+def test_record_views_multi_row_insert(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (2,)
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    assert record_views([(10, 1), (11, 1), (10, 2)]) == 2
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "from unnest(%s::bigint[], %s::bigint[])" in normalized_sql
+    assert "on conflict do nothing" in normalized_sql
+
+    params = mock_cursor.execute.call_args[0][1]
+    assert params == ([10, 11, 10], [1, 1, 2])
+
+
+def test_get_posts_by_ids_keeps_request_order(mock_conn, serve_rows):
+    now = datetime.now(UTC)
+    rows = [
+        {
+            "post_id": post_id,
+            "text": f"Post {post_id}",
+            "reply_to_id": None,
+            "created_at": now,
+            "user_id": 1,
+            "user_name": "username",
+            "first_name": "first_name",
+            "last_name": "last_name",
+            "likes_count": 0,
+            "views_count": 0,
+            "replies_count": 0,
+            "user_liked": post_id == 1,
+            "user_viewed": False,
+        }
+        for post_id in (1, 3)
+    ]
+
+    mock_cursor = MagicMock()
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+    serve_rows(mock_conn.return_value.__enter__.return_value.cursor, mock_cursor, rows)
+
+    result = get_posts_by_ids([3, 2, 1], 7)
+
+    assert [post["id"] for post in result] == [3, 1]
+    assert result[1]["user_liked"] is True
+    assert "where p.id = any(%s) and p.deleted_at is null" in normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert mock_cursor.execute.call_args[0][1] == (7, 7, [3, 2, 1])
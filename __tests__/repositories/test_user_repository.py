@@ -7,8 +7,10 @@ from repositories.user_repository import (
     get_all_users,
     get_user_by_id,
     get_user_by_username,
+    get_users_by_ids,
     update_user,
     delete_user,
+    estimate_users_count,
 )
 
 def normalize_sql(sql: str) -> str:
@@ -220,4 +222,54 @@ def test_delete_user_not_found(mock_conn):
     mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
 
     with pytest.raises(ValueError, match="User not found"):
-        delete_user(2)
\ No newline at end of file
+        delete_user(2)
+
+
+def test_get_users_by_ids_keeps_request_order(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [
+        {"id": 1, "user_name": "john", "first_name": "John", "last_name": "Doe", "status": 1},
+        {"id": 2, "user_name": "jane", "first_name": "Jane", "last_name": "Smith", "status": 1},
+    ]
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    result = get_users_by_ids([2, 5, 1])
+
+    assert [user["id"] for user in result] == [2, 1]
+    assert "where id = any(%s)" in normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert mock_cursor.execute.call_args[0][1] == ([2, 5, 1],)
+
+
+def test_get_all_users_is_ordered_by_id(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = []
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    get_all_users(limit=10, offset=20)
+
+    assert "where deleted_at is null order by id offset %s limit %s" in normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert mock_cursor.execute.call_args[0][1] == (20, 10)
+
+
+def test_get_all_users_after_id_uses_keyset(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = []
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    get_all_users(limit=10, offset=20, after_id=57)
+
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "where deleted_at is null and id > %s order by id limit %s" in normalized_sql
+    assert "offset" not in normalized_sql
+    assert mock_cursor.execute.call_args[0][1] == (57, 10)
+
+
+def test_estimate_users_count_reads_planner_statistics(mock_conn):
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (1234,)
+    mock_conn.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    assert estimate_users_count() == 1234
+    normalized_sql = normalize_sql(mock_cursor.execute.call_args[0][0])
+    assert "from pg_class" in normalized_sql
+    assert "count(" not in normalized_sql
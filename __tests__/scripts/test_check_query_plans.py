@@ -0,0 +1,20 @@
+from scripts.check_query_plans import seq_scans
+
+
+def test_seq_scans_walks_nested_plans():
+    plan = {
+        "Node Type": "Nested Loop",
+        "Plans": [
+            {"Node Type": "Index Scan", "Relation Name": "posts"},
+            {
+                "Node Type": "Hash",
+                "Plans": [{"Node Type": "Seq Scan", "Relation Name": "users"}],
+            },
+        ],
+    }
+
+    assert seq_scans(plan) == ["users"]
+
+
+def test_seq_scans_none():
+    assert seq_scans({"Node Type": "Index Only Scan", "Relation Name": "likes"}) == []
@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+import pytest
+
+from scripts.load_test import Context, parse_args, parse_mix, percentile, prepare, run, summarize
+
+
+def test_parse_mix():
+    assert parse_mix("feed=3,login=1") == {"feed": 3.0, "login": 1.0}
+    with pytest.raises(ValueError, match="Unknown scenario"):
+        parse_mix("feed=1,unknown=2")
+
+
+def test_percentile_nearest_rank():
+    values = sorted(float(v) for v in range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 99) == 0
+
+
+def test_summarize_counts_errors_per_route():
+    result = summarize({"feed": [(10.0, 200), (30.0, 200), (20.0, 500), (40.0, 0)]}, duration=2)
+
+    route = result["routes"]["feed"]
+    assert route["count"] == 4
+    assert route["rps"] == 2
+    assert route["error_rate"] == 0.5
+    assert route["p50_ms"] == 20
+    assert route["max_ms"] == 40
+    assert route["statuses"] == {"200": 2, "500": 1, "0": 1}
+    assert result["requests"] == 4
+
+
+def test_run_drives_mix_against_app():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/auth/login":
+            return httpx.Response(200, json={"access_token": "token"})
+        if request.url.path == "/api/posts/" and request.method == "GET":
+            return httpx.Response(200, json=[{"id": 1, "replies_count": 2}, {"id": 2, "replies_count": 0}])
+        return httpx.Response(201, json={"viewed": []})
+
+    args = parse_args(["--duration", "0.2", "--concurrency", "2", "--tokens", "1"])
+    ctx = Context(args)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+            await prepare(client, ctx)
+            return await run(client, ctx, parse_mix("feed=1,thread=1,view=1"))
+
+    result = asyncio.run(scenario())
+
+    assert ctx.thread_ids[:1] == [1]
+    assert set(result["routes"]) == {"feed", "thread", "view"}
+    assert result["error_rate"] == 0
+
+
+def test_rate_mode_counts_queueing_delay():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/auth/login":
+            return httpx.Response(200, json={"access_token": "token"})
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json=[{"id": 1, "replies_count": 0}])
+
+    # 20 запросов за 0.1 с при одном слоте и 20 мс на ответ: сервер отстаёт, очередь растёт
+    args = parse_args(["--duration", "0.1", "--rate", "200", "--concurrency", "1", "--tokens", "1"])
+    ctx = Context(args)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+            await prepare(client, ctx)
+            return await run(client, ctx, parse_mix("feed=1"))
+
+    route = asyncio.run(scenario())["routes"]["feed"]
+
+    assert route["count"] == 20
+    # последний запрос ждёт ~19 ответов перед собой, а не только свои 20 мс
+    assert route["p95_ms"] > 200
+    assert route["max_ms"] > 300
@@ -0,0 +1,126 @@
+from unittest.mock import patch
+
+import pytest
+
+from scripts import migrate as migrate_module
+from scripts.migrate import (MIGRATIONS_DIR, NO_TRANSACTION_MARKER, apply_migration, concurrent_index_name,
+                             migrate, pending_migrations, split_statements)
+
+
+class FakeResult(list):
+    def fetchone(self):
+        return self[0] if self else None
+
+
+class FakeConn:
+    """Минимальная модель каталога: индексы с indisvalid и schema_migrations."""
+
+    def __init__(self, indexes=None, applied=(), build_valid=True):
+        self.indexes = dict(indexes or {})
+        self.applied = list(applied)
+        self.build_valid = build_valid
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        if "FROM pg_index" in sql:
+            valid = self.indexes.get(params[0])
+            return FakeResult([] if valid is None else [(valid,)])
+        if sql.startswith("DROP INDEX CONCURRENTLY"):
+            self.indexes.pop(sql.rsplit(" ", 1)[1], None)
+        elif index := concurrent_index_name(sql):
+            self.indexes.setdefault(index, self.build_valid)
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            self.applied.append(params[0])
+        elif "SELECT version FROM schema_migrations" in sql:
+            return FakeResult([(version,) for version in self.applied])
+        return FakeResult()
+
+    def transaction(self):
+        return self
+
+
+def test_migrations_are_ordered():
+    versions = [path.stem for path in pending_migrations(set())]
+
+    assert versions == sorted(versions)
+    assert versions[0] == "0001_initial_schema"
+
+
+def test_pending_skips_applied():
+    versions = [path.stem for path in pending_migrations({"0001_initial_schema", "0002_post_counters"})]
+
+    assert "0001_initial_schema" not in versions
+    assert "0003_posts_text_search" in versions
+
+
+def test_split_statements():
+    sql = """
+        -- migrate: no-transaction
+        -- comment
+        CREATE INDEX CONCURRENTLY a_idx ON a (id);
+
+        CREATE INDEX CONCURRENTLY b_idx ON b (id)
+            WHERE deleted_at IS NULL;
+        -- trailing comment
+    """
+
+    statements = split_statements(sql)
+
+    assert len(statements) == 2
+    assert statements[0].endswith("CREATE INDEX CONCURRENTLY a_idx ON a (id)")
+    assert statements[1].startswith("CREATE INDEX CONCURRENTLY b_idx")
+
+
+def test_concurrent_index_migrations_run_outside_transaction():
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        sql = path.read_text()
+        if "CONCURRENTLY" in sql:
+            assert NO_TRANSACTION_MARKER in sql, path.name
+
+
+def test_failed_concurrent_build_is_rebuilt_on_retry():
+    path = MIGRATIONS_DIR / "0005_users_keyset_index.sql"
+    # прошлый запуск упал посреди CREATE INDEX CONCURRENTLY: индекс есть, но INVALID
+    conn = FakeConn(indexes={"users_active_id_idx": False})
+
+    apply_migration(conn, path)
+
+    assert "DROP INDEX CONCURRENTLY IF EXISTS users_active_id_idx" in conn.statements
+    assert conn.indexes == {"users_active_id_idx": True}
+    assert conn.applied == ["0005_users_keyset_index"]
+
+
+def test_invalid_index_after_build_is_not_recorded():
+    path = MIGRATIONS_DIR / "0004_feed_indexes.sql"
+    conn = FakeConn(build_valid=False)
+
+    with pytest.raises(RuntimeError, match="posts_feed_idx"):
+        apply_migration(conn, path)
+
+    assert conn.applied == []
+
+
+def test_valid_index_is_not_dropped():
+    conn = FakeConn(indexes={"users_active_id_idx": True})
+
+    apply_migration(conn, MIGRATIONS_DIR / "0005_users_keyset_index.sql")
+
+    assert not any(statement.startswith("DROP") for statement in conn.statements)
+
+
+@pytest.mark.parametrize("baseline", ["0001", "0001_initial_schema"])
+def test_baseline_marks_migrations_by_number(baseline):
+    conn = FakeConn()
+    with patch.object(migrate_module.psycopg, "connect", return_value=conn), \
+         patch.object(migrate_module, "apply_migration") as apply:
+        migrate(baseline)
+
+    assert conn.applied == ["0001_initial_schema"]
+    assert [call.args[1].stem for call in apply.call_args_list][0] == "0002_post_counters"
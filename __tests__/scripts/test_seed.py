@@ -0,0 +1,54 @@
+import random
+from collections import Counter
+
+import pytest
+
+from scripts.seed import build_posts, coprime_step, engagement, parse_args, rank_to_id, zipf_rank
+
+
+def small_args(**overrides):
+    args = parse_args(["--users", "50", "--posts", "400", "--views", "2000", "--likes", "500"])
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    return args
+
+
+def test_zipf_rank_is_skewed_and_bounded():
+    rng = random.Random(1)
+    ranks = Counter(zipf_rank(rng, 1000, 1.1) for _ in range(20000))
+
+    assert min(ranks) >= 1 and max(ranks) <= 1000
+    assert ranks[1] > ranks[10] > ranks[100]
+
+
+def test_rank_to_id_is_a_bijection():
+    n = 97
+    step = coprime_step(n, random.Random(3))
+    assert sorted(rank_to_id(rank, n, step, 5) for rank in range(1, n + 1)) == list(range(1, n + 1))
+
+
+def test_build_posts_respects_depth_and_counts_replies():
+    args = small_args(max_depth=2, reply_ratio=0.9)
+    authors, parents, replies = build_posts(args)
+
+    depth = {}
+    for i, parent in enumerate(parents, start=1):
+        assert parent < i
+        depth[i] = depth[parent] + 1 if parent else 0
+        assert depth[i] <= 2
+    assert sum(replies) == sum(1 for parent in parents if parent)
+    assert all(1 <= author <= args.users for author in authors)
+
+
+def test_engagement_is_deterministic_and_unique():
+    args = small_args()
+    first = list(engagement(args))
+
+    assert first == list(engagement(args))
+    assert len({(user_id, post_id) for user_id, post_id, _ in first}) == len(first)
+    assert first != list(engagement(small_args(seed=2)))
+
+
+def test_parse_args_rejects_more_likes_than_views():
+    with pytest.raises(SystemExit):
+        parse_args(["--views", "10", "--likes", "20"])
@@ -0,0 +1,31 @@
+from unittest.mock import MagicMock
+
+from scripts.statement_report import report, summarize
+
+
+def test_summarize_prepared_statement():
+    row = (42, 1000, 4, 2.0, 500.0, 10000, "SELECT p.id\n    FROM posts p   WHERE p.id = $1")
+
+    result = summarize(row)
+
+    assert result["plans_per_call"] == 0.004
+    assert result["mean_plan_ms"] == 0.5
+    assert result["mean_exec_ms"] == 0.5
+    assert result["total_ms"] == 502.0
+    assert result["rows_per_call"] == 10
+    assert result["query"] == "SELECT p.id FROM posts p WHERE p.id = $1"
+
+
+def test_summarize_without_planning_stats():
+    result = summarize((1, 0, 0, 0.0, 0.0, 0, "SELECT 1"))
+
+    assert result["plans_per_call"] == 0
+    assert result["mean_plan_ms"] == 0
+
+
+def test_report_limits_to_top():
+    conn = MagicMock()
+    conn.execute.return_value.fetchall.return_value = [(1, 2, 2, 1.0, 3.0, 2, "SELECT 1")]
+
+    assert report(conn, 5)[0]["calls"] == 2
+    assert conn.execute.call_args[0][1] == (5,)
@@ -80,3 +80,19 @@ def test_register_success():
             "access_token": "access123",
             "refresh_token": "refresh123",
         }
+
+
+def test_register_drops_negative_cache_entry():
+    from services import user_cache
+
+    user_cache.store(42, user_cache.NOT_FOUND, user_cache.generation())
+    dto = {"user_name": "newuser", "password": "password123", "first_name": "New", "last_name": "User"}
+
+    with (
+        patch("bcrypt.hashpw", return_value=b"hashed_password"),
+        patch("services.auth_service.create_user", return_value={"id": 42}),
+        patch("services.auth_service.generate_token_pair", return_value={}),
+    ):
+        auth_service.register(dto)
+
+    assert user_cache.get(42) is user_cache.MISSING
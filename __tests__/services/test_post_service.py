@@ -1,8 +1,10 @@
+from datetime import datetime
 from unittest.mock import patch
 
 import pytest
 
 from services import post_service
+from utils.pagination import encode_cursor
 
 
 def test_get_all_posts_success():
@@ -85,3 +87,79 @@ def test_dislike_post_error():
         with pytest.raises(Exception, match="Dislike error"):
             post_service.dislike_post(2, 0)
         mock.assert_called_once_with(2, 0)
+
+
+def test_get_all_posts_decodes_cursor():
+    created_at = datetime(2025, 4, 24, 20, 55, 53)
+    cursor = encode_cursor(created_at, 7)
+
+    with patch("repositories.post_repository.get_all_posts", return_value=[]) as mock:
+        post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 0, "cursor": cursor})
+        assert mock.call_args[0][0]["after"] == (created_at, 7)
+
+
+def test_get_all_posts_invalid_cursor():
+    with patch("repositories.post_repository.get_all_posts") as mock:
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 0, "cursor": "broken"})
+        mock.assert_not_called()
+
+
+@pytest.fixture
+def cached_feed():
+    from services import feed_cache
+    feed_cache.invalidate()
+    yield feed_cache.feed_cache
+    feed_cache.invalidate()
+
+
+def test_get_all_posts_cache_hit_overlays_user_flags(cached_feed):
+    posts = [{"id": 1, "text": "post1", "user_liked": True, "user_viewed": True}]
+    with patch("services.post_service.post_repository.get_all_posts", return_value=posts) as mock_page, \
+            patch("services.post_service.post_repository.get_user_post_flags",
+                  return_value={1: (False, True)}) as mock_flags:
+        assert post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 0}) == posts
+        result = post_service.get_all_posts({"user_id": 2, "limit": 10, "offset": 0})
+
+    mock_page.assert_called_once()
+    mock_flags.assert_called_once_with([1], 2)
+    assert result == [{"id": 1, "text": "post1", "user_liked": False, "user_viewed": True}]
+
+
+def test_get_all_posts_cache_key_includes_filters(cached_feed):
+    with patch("services.post_service.post_repository.get_all_posts", return_value=[]) as mock_page:
+        post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 0})
+        post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 10})
+        post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 0, "search": "go"})
+        post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 0})
+    assert mock_page.call_count == 3
+
+
+def test_create_post_invalidates_feed_cache(cached_feed):
+    with patch("services.post_service.post_repository.get_all_posts", return_value=[]) as mock_page, \
+            patch("services.post_service.post_repository.create_post", return_value={"id": 1}):
+        post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 0})
+        post_service.create_post({"text": "new post", "user_id": 1})
+        post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 0})
+    assert mock_page.call_count == 2
+
+
+def test_get_posts_by_ids_reports_missing():
+    posts = [{"id": 3}, {"id": 1}]
+    with patch("services.post_service.post_repository.get_posts_by_ids", return_value=posts) as mock:
+        result = post_service.get_posts_by_ids([3, 2, 1], 7)
+
+    mock.assert_called_once_with([3, 2, 1], 7)
+    assert result == {"posts": posts, "missing": [2]}
+
+
+def test_feed_page_read_before_write_is_not_cached(cached_feed):
+    def load(filter_dto):
+        post_service.create_post({"text": "new post", "user_id": 1})  # запись завершилась, пока шло чтение
+        return [{"id": 1, "text": "post1", "user_liked": False, "user_viewed": False}]
+
+    with patch("services.post_service.post_repository.get_all_posts", side_effect=load), \
+            patch("services.post_service.post_repository.create_post", return_value={"id": 2}):
+        post_service.get_all_posts({"user_id": 1, "limit": 10, "offset": 0})
+
+    assert cached_feed.stats()["size"] == 0
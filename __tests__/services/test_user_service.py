@@ -3,7 +3,14 @@ from unittest.mock import patch
 
 import pytest
 
-from services import user_service
+from services import user_cache, user_service
+
+
+@pytest.fixture(autouse=True)
+def clean_user_cache():
+    user_cache.user_cache.clear()
+    yield
+    user_cache.user_cache.clear()
 
 
 def test_get_all_users_success():
@@ -113,3 +120,107 @@ def test_delete_user_failure():
         with pytest.raises(Exception, match="Delete error"):
             user_service.delete_user(2)
         mock.assert_called_once_with(2)
+
+
+def test_get_user_by_id_coalesces_concurrent_calls():
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    release = threading.Event()
+
+    def load(user_id):
+        release.wait(timeout=5)
+        return {"id": user_id}
+
+    coalesced = user_service.user_reads.stats()["coalesced"]
+    with patch("services.user_service.user_repository.get_user_by_id", side_effect=load) as mock:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(user_service.get_user_by_id, 1) for _ in range(3)]
+            deadline = time.monotonic() + 2
+            while user_service.user_reads.stats()["coalesced"] < coalesced + 2 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            waiting = user_service.user_reads.stats()["coalesced"] - coalesced
+            release.set()
+            assert waiting == 2
+            results = [future.result(timeout=5) for future in futures]
+
+    assert all(result == {"id": 1} for result in results)
+    mock.assert_called_once_with(1)
+
+
+def test_get_user_by_id_is_served_from_cache():
+    with patch("services.user_service.user_repository.get_user_by_id", return_value={"id": 3}) as mock:
+        assert user_service.get_user_by_id(3) == {"id": 3}
+        assert user_service.get_user_by_id(3) == {"id": 3}
+    mock.assert_called_once_with(3)
+
+
+def test_get_user_by_id_caches_missing_ids():
+    negative_hits = user_cache.user_cache_stats()["negative_hits"]
+    with patch("services.user_service.user_repository.get_user_by_id",
+               side_effect=ValueError("User not found")) as mock:
+        for _ in range(3):
+            with pytest.raises(ValueError, match="User not found"):
+                user_service.get_user_by_id(404)
+
+    mock.assert_called_once_with(404)
+    assert user_cache.user_cache_stats()["negative_hits"] == negative_hits + 2
+
+
+def test_get_user_by_id_does_not_cache_other_errors():
+    with patch("services.user_service.user_repository.get_user_by_id", side_effect=Exception("SQL error")) as mock:
+        for _ in range(2):
+            with pytest.raises(Exception, match="SQL error"):
+                user_service.get_user_by_id(5)
+    assert mock.call_count == 2
+
+
+def test_update_and_delete_invalidate_cached_user():
+    with patch("services.user_service.user_repository.get_user_by_id",
+               side_effect=[{"id": 3, "first_name": "Old"}, {"id": 3, "first_name": "New"}, ValueError("User not found")]), \
+         patch("services.user_service.user_repository.update_user", return_value={"id": 3}), \
+         patch("services.user_service.user_repository.delete_user"):
+        assert user_service.get_user_by_id(3)["first_name"] == "Old"
+        user_service.update_user(3, {"first_name": "New"})
+        assert user_service.get_user_by_id(3)["first_name"] == "New"
+        user_service.delete_user(3)
+        with pytest.raises(ValueError, match="User not found"):
+            user_service.get_user_by_id(3)
+
+
+def test_read_started_before_write_is_not_cached():
+    def load(user_id):
+        user_cache.invalidate(user_id)  # запись завершилась, пока шло чтение
+        return {"id": user_id, "first_name": "Stale"}
+
+    with patch("services.user_service.user_repository.get_user_by_id", side_effect=load):
+        user_service.get_user_by_id(3)
+
+    assert user_cache.get(3) is user_cache.MISSING
+
+
+def test_get_users_by_ids_reports_missing_and_uses_cache():
+    with patch("services.user_service.user_repository.get_user_by_id", return_value={"id": 2}):
+        user_service.get_user_by_id(2)
+
+    with patch("services.user_service.user_repository.get_users_by_ids", return_value=[{"id": 1}]) as mock:
+        result = user_service.get_users_by_ids([1, 2, 9, 1])
+        again = user_service.get_users_by_ids([9, 1])
+
+    mock.assert_called_once_with([1, 9])
+    assert result == {"users": [{"id": 1}, {"id": 2}], "missing": [9]}
+    assert again == {"users": [{"id": 1}], "missing": [9]}
+
+
+def test_get_all_users_decodes_cursor():
+    from utils.pagination import encode_id_cursor
+
+    with patch("services.user_service.user_repository.get_all_users", return_value=[]) as mock:
+        user_service.get_all_users(10, 0, encode_id_cursor(57))
+    mock.assert_called_once_with(10, 0, 57)
+
+
+def test_get_all_users_invalid_cursor():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        user_service.get_all_users(10, 0, "not-a-cursor")
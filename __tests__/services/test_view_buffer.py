@@ -0,0 +1,103 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from services import post_service
+from services.view_buffer import ViewBuffer
+
+
+def make_buffer(flush_fn=None, max_size=100, flush_size=10, flush_interval=60):
+    flush_fn = flush_fn or MagicMock(side_effect=lambda batch: len(batch))
+    return ViewBuffer(flush_fn=flush_fn, max_size=max_size, flush_size=flush_size, flush_interval=flush_interval)
+
+
+def test_deduplicates_and_flushes_batch():
+    buffer = make_buffer()
+    buffer.add(1, 10)
+    buffer.add(1, 10)
+    buffer.add(2, 10)
+
+    assert buffer.flush() == 2
+    buffer.flush_fn.assert_called_once_with([(10, 1), (10, 2)])
+
+    stats = buffer.stats()
+    assert stats["deduplicated"] == 1
+    assert stats["flushed_views"] == 2
+    assert stats["last_flush_size"] == 2
+    assert stats["pending"] == 0
+
+
+def test_empty_flush_does_not_hit_database():
+    buffer = make_buffer()
+
+    assert buffer.flush() == 0
+    buffer.flush_fn.assert_not_called()
+
+
+def test_full_buffer_flushes_in_caller():
+    buffer = make_buffer(max_size=2)
+    buffer.add(1, 10)
+    buffer.add(2, 10)
+
+    assert buffer.offer(3, 10) is False
+    buffer.add(3, 10)
+
+    buffer.flush_fn.assert_called_once_with([(10, 1), (10, 2)])
+    assert buffer.stats()["pending"] == 1
+
+
+def test_failed_flush_requeues_views():
+    buffer = make_buffer(flush_fn=MagicMock(side_effect=Exception("db down")))
+    buffer.add(1, 10)
+
+    assert buffer.flush() == 0
+
+    stats = buffer.stats()
+    assert stats["flush_errors"] == 1
+    assert stats["pending"] == 1
+
+
+def test_drops_view_when_full_and_database_down():
+    buffer = make_buffer(flush_fn=MagicMock(side_effect=Exception("db down")), max_size=1)
+    buffer.add(1, 10)
+    buffer.add(2, 10)
+
+    stats = buffer.stats()
+    assert stats["pending"] == 1
+    assert stats["dropped_views"] == 1
+
+
+def test_background_flush_on_size_threshold():
+    buffer = make_buffer(flush_size=2)
+    buffer.start()
+    try:
+        buffer.add(1, 10)
+        buffer.add(2, 10)
+        for _ in range(100):
+            if buffer.flush_fn.called:
+                break
+            time.sleep(0.01)
+    finally:
+        buffer.stop()
+
+    buffer.flush_fn.assert_called_once_with([(10, 1), (10, 2)])
+
+
+def test_stop_drains_buffer():
+    buffer = make_buffer()
+    buffer.start()
+    buffer.add(1, 10)
+    buffer.stop()
+
+    buffer.flush_fn.assert_called_once_with([(10, 1)])
+
+
+def test_view_post_uses_buffer_when_enabled():
+    with (
+        patch("services.post_service.VIEW_BUFFER_ENABLED", True),
+        patch("services.post_service.view_buffer") as mock_buffer,
+        patch("repositories.post_repository.view_post") as mock_view,
+    ):
+        assert post_service.view_post(1, 10) is None
+
+    mock_buffer.add.assert_called_once_with(1, 10)
+    mock_view.assert_not_called()
@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from utils.cache import MISSING, TTLCache
+
+
+def test_get_set():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    assert cache.get("a") is MISSING
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_none_is_a_valid_value():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", None)
+
+    assert cache.get("a") is None
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_expires():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    with patch("utils.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1, ttl=5)
+    with patch("utils.cache.time.monotonic", return_value=104.9):
+        assert cache.get("a") == 1
+    with patch("utils.cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") is MISSING
+
+    assert cache.stats()["size"] == 0
+
+
+def test_ttl_is_capped_by_cache_ttl():
+    cache = TTLCache(max_size=10, ttl=10)
+
+    with patch("utils.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1, ttl=1000)
+    with patch("utils.cache.time.monotonic", return_value=110.0):
+        assert cache.get("a") is MISSING
+
+
+def test_non_positive_ttl_is_not_stored():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1, ttl=-1)
+
+    assert cache.stats()["size"] == 0
+
+
+def test_disabled_cache():
+    cache = TTLCache(max_size=0, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") is MISSING
+
+
+def test_delete_and_clear():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.delete("a")
+    assert cache.get("a") is MISSING
+
+    cache.clear()
+    assert cache.get("b") is MISSING
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from utils import hashing
+
+
+@pytest.fixture(autouse=True)
+def fast_rounds():
+    with patch("utils.hashing.BCRYPT_ROUNDS", 4):
+        yield
+
+
+def test_hash_and_check_password():
+    password_hash = hashing.hash_password("test123!")
+
+    assert password_hash.startswith("$2b$04$")
+    assert hashing.check_password("test123!", password_hash)
+    assert not hashing.check_password("wrong123!", password_hash)
+
+
+def test_async_hash_and_check_password():
+    async def run():
+        password_hash = await hashing.hash_password_async("test123!")
+        return await hashing.check_password_async("test123!", password_hash)
+
+    assert asyncio.run(run())
+
+
+def test_rejects_when_queue_is_full():
+    before = hashing.hashing_stats()["rejected"]
+
+    with patch("utils.hashing._slots", threading.BoundedSemaphore(1)) as slots:
+        slots.acquire()
+        with pytest.raises(hashing.HashingOverloadedError):
+            hashing.hash_password("test123!")
+
+    assert hashing.hashing_stats()["rejected"] == before + 1
+
+
+def test_slot_released_after_completion():
+    with patch("utils.hashing._slots", threading.BoundedSemaphore(1)) as slots:
+        hashing.hash_password("test123!")
+        # слот освобождается done-callback'ом в потоке воркера
+        for _ in range(100):
+            if slots.acquire(timeout=0.01):
+                break
+        else:
+            pytest.fail("hashing slot was not released")
@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import app
+from repositories import post_queries, user_queries
+from utils import metrics
+
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("test_latency_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.1, "/a")
+    histogram.observe(3, "/a")
+
+    assert histogram.render() == [
+        "# HELP test_latency_seconds Test latency",
+        "# TYPE test_latency_seconds histogram",
+        'test_latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'test_latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'test_latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_latency_seconds_sum{route="/a"} 3.15',
+        'test_latency_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_gauge_and_label_escaping():
+    gauge = metrics.Gauge("test_in_flight", "Test gauge", ("name",))
+    gauge.inc('a"b')
+    gauge.inc('a"b')
+    gauge.dec('a"b')
+
+    assert gauge.render()[-1] == 'test_in_flight{name="a\\"b"} 1'
+
+
+def test_repository_queries_have_names():
+    query, _ = post_queries.get_all_posts_query(
+        {"user_id": 1, "owner_id": 2, "limit": 10, "offset": 0, "search": "go"}
+    )
+    update, _ = user_queries.update_user_query(1, {"first_name": "Ivan"})
+
+    assert metrics.query_name(post_queries.GET_POST_BY_ID) == "post_queries.GET_POST_BY_ID"
+    assert metrics.query_name(query) == "post_queries.feed[search,owner]"
+    assert metrics.query_name(update) == "user_queries.update_user"
+    assert metrics.query_name("SELECT 1") == "other"
+
+
+def test_metrics_endpoint_reports_routes_by_template():
+    with patch("controllers.user_controller.get_user_by_id", return_value={
+        "id": 5, "user_name": "user5", "first_name": None, "last_name": None, "status": 1,
+    }):
+        assert client.get("/api/users/5").status_code == 200
+
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/users/{user_id}",status="200"}' in res.text
+    assert "http_requests_in_flight" in res.text
+    assert 'app_stat{group="token_cache",name="hits"}' in res.text
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+from utils.pagination import (MAX_BATCH_IDS, decode_cursor, decode_id_cursor, encode_cursor, encode_id_cursor,
+                              next_cursor, next_id_cursor, parse_ids)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 4, 24, 20, 55, 53, 21000)
+
+    cursor = encode_cursor(created_at, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", "eyJhIjogMX0"])
+def test_decode_cursor_invalid(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_next_cursor_full_page():
+    created_at = datetime(2025, 4, 24, 20, 55, 53)
+    rows = [{"id": 2, "created_at": created_at}, {"id": 1, "created_at": created_at}]
+
+    assert decode_cursor(next_cursor(rows, 2)) == (created_at, 1)
+
+
+def test_next_cursor_last_page():
+    rows = [{"id": 1, "created_at": datetime(2025, 4, 24)}]
+
+    assert next_cursor(rows, 10) is None
+
+
+def test_parse_ids_keeps_order_and_drops_duplicates():
+    assert parse_ids("3,1, 2,3,") == [3, 1, 2]
+
+
+@pytest.mark.parametrize("raw, message", [
+    ("", "must not be empty"),
+    ("1,a", "comma-separated list of integers"),
+    ("1,0", "must be positive"),
+    (",".join(str(i) for i in range(1, MAX_BATCH_IDS + 2)), "At most"),
+])
+def test_parse_ids_invalid(raw, message):
+    with pytest.raises(ValueError, match=message):
+        parse_ids(raw)
+
+
+def test_id_cursor_round_trip():
+    assert decode_id_cursor(encode_id_cursor(42)) == 42
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(datetime(2025, 4, 24), 1), "WyJhIl0"])
+def test_decode_id_cursor_invalid(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_id_cursor(cursor)
+
+
+def test_next_id_cursor():
+    rows = [{"id": 3}, {"id": 7}]
+
+    assert decode_id_cursor(next_id_cursor(rows, 2)) == 7
+    assert next_id_cursor(rows, 3) is None
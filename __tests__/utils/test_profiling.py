@@ -0,0 +1,94 @@
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import app
+from utils import profiling
+
+
+client = TestClient(app)
+
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def join_samplers():
+    for thread in threading.enumerate():
+        if thread.name == "profile-sampler":
+            thread.join(timeout=5)
+
+
+def test_sampler_only_counts_the_profiled_request():
+    stop = threading.Event()
+
+    def other_request():
+        while not stop.is_set():
+            spin(0.001)
+
+    other = threading.Thread(target=other_request)
+    other.start()
+    sampler = profiling.Sampler(0.001, root_frame=sys._getframe())
+    sampler.start()
+    try:
+        spin(0.05)
+    finally:
+        sampler.stop("test")
+        sampler.join()
+        stop.set()
+        other.join()
+
+    assert any(stack.endswith("test_sampler_only_counts_the_profiled_request;test_profiling.spin")
+               for stack in sampler.samples)
+    assert all("test_sampler_only_counts_the_profiled_request" in stack for stack in sampler.samples)
+
+
+def test_should_profile_requires_matching_token():
+    with patch.object(profiling, "PROFILE_TOKEN", "secret"):
+        assert profiling.should_profile({"headers": [(b"x-profile", b"secret")]})
+        assert not profiling.should_profile({"headers": [(b"x-profile", b"guess")]})
+    assert not profiling.should_profile({"headers": [(b"x-profile", b"")]})
+
+
+def test_profiled_request_is_aggregated_by_route():
+    def profiled_work():
+        spin(0.03)
+
+    def concurrent_work():
+        spin(0.06)
+
+    def get_user_by_id(user_id):
+        profiled_work() if user_id == 5 else concurrent_work()
+        return {"id": user_id, "user_name": "user5", "first_name": None, "last_name": None, "status": 1}
+
+    profiling.reset()
+    with patch.object(profiling, "PROFILE_TOKEN", "secret"), \
+         patch("controllers.user_controller.get_user_by_id", side_effect=get_user_by_id):
+        # параллельный непрофилируемый запрос не должен попасть в профиль
+        other = threading.Thread(target=client.get, args=("/api/users/6",))
+        other.start()
+        assert client.get("/api/users/5", headers={"X-Profile": "secret"}).status_code == 200
+        other.join()
+        join_samplers()
+
+        res = client.get("/debug/profile", headers={"X-Profile": "secret"})
+        by_route = client.get("/debug/profile", params={"route": "/api/users/{user_id}"}, headers={"X-Profile": "secret"})
+
+    assert res.status_code == 200
+    assert res.text.startswith("/api/users/{user_id};")
+    assert "controllers.user_controller.get_by_id" in by_route.text
+    assert "profiled_work" in by_route.text
+    assert "concurrent_work" not in by_route.text
+    assert by_route.text.split("\n")[0].rsplit(" ", 1)[1].isdigit()
+    assert profiling.profiling_stats()["profiled_requests"] >= 1
+
+
+def test_profile_endpoint_is_hidden_without_token():
+    assert client.get("/debug/profile").status_code == 404
+    with patch.object(profiling, "PROFILE_TOKEN", "secret"):
+        assert client.get("/debug/profile", headers={"X-Profile": "guess"}).status_code == 404
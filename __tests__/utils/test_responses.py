@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+
+from utils.responses import TrustedJSONResponse
+
+
+def test_trusted_response_renders_datetimes_like_pydantic():
+    created_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    response = TrustedJSONResponse([{"id": 1, "created_at": created_at}])
+    assert response.body == b'[{"id":1,"created_at":"2024-01-02T03:04:05Z"}]'
+    assert response.media_type == "application/json"
+
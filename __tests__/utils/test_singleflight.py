@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"id": 1}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flight.do, "key", load) for _ in range(4)]
+        deadline = time.monotonic() + 2
+        while flight.stats()["coalesced"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        coalesced = flight.stats()["coalesced"]
+        release.set()
+        assert coalesced == 3
+        results = [future.result(timeout=5) for future in futures]
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(result == {"id": 1} for result, _ in results)
+    assert flight.stats() == {"calls": 4, "coalesced": 3, "in_flight": 0}
+
+
+def test_error_is_shared_and_key_released():
+    flight = SingleFlight()
+
+    with pytest.raises(ValueError, match="User not found"):
+        flight.do("key", lambda: (_ for _ in ()).throw(ValueError("User not found")))
+
+    assert flight.do("key", lambda: 42) == (42, False)
+
+
+def test_async_concurrent_calls_share_one_execution():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [1, 2]
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", load) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [shared for _, shared in results] == [False, True, True, True, True]
+    assert flight.stats() == {"calls": 5, "coalesced": 4, "in_flight": 0}
+
+
+def test_async_cancelled_waiter_does_not_cancel_call():
+    flight = AsyncSingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("key", load))
+        second = asyncio.ensure_future(flight.do("key", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == ("done", True)
@@ -0,0 +1,113 @@
+import logging
+import threading
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import app
+from utils import tracing
+
+
+client = TestClient(app)
+
+
+def get_all_posts():
+    return tracing.caller_name(1)
+
+
+def test_caller_name_uses_module_and_function():
+    assert get_all_posts() == "test_tracing.get_all_posts"
+
+
+def test_record_query_accumulates_per_trace():
+    trace = tracing.RequestTrace()
+    token = tracing.current_trace.set(trace)
+    try:
+        tracing.record_pool_wait(0.002)
+        tracing.record_query("post_repository.get_all_posts", "SELECT 1", None, 0.003)
+        tracing.record_query("post_repository.get_user_post_flags", "SELECT 2", None, 0.001)
+    finally:
+        tracing.current_trace.reset(token)
+
+    assert trace.queries == 2
+    assert trace.db_seconds == 0.004
+    assert trace.slowest_name == "post_repository.get_all_posts"
+    assert trace.server_timing(0.01) == (
+        'db;dur=4.00;desc="2 queries", pool;dur=2.00, '
+        'slowest;dur=3.00;desc="post_repository.get_all_posts", app;dur=10.00'
+    )
+
+
+def test_record_query_without_trace_is_noop():
+    tracing.record_query("view_buffer.flush", "SELECT 1", None, 0.001)
+    assert tracing.current_trace.get() is None
+
+
+def test_slow_read_is_logged_and_sampled_for_explain(caplog):
+    with patch.object(tracing, "SLOW_QUERY_EXPLAIN_RATE", 1.0), \
+         patch.object(tracing, "_explain_slot", threading.Semaphore(1)), \
+         patch.object(tracing._explainer, "submit") as submit, \
+         caplog.at_level(logging.WARNING, logger="utils.tracing"):
+        tracing.record_query("post_repository.get_post_by_id", "SELECT *\n  FROM posts WHERE id = %s", (7,), 0.5)
+        tracing.record_query("post_repository.delete_post", "UPDATE posts SET deleted_at = now()", (7,), 0.5)
+
+    assert "SELECT * FROM posts WHERE id = %s" in caplog.text
+    assert "params: (7,)" in caplog.text
+    submit.assert_called_once()
+    assert submit.call_args.args[1] == "post_repository.get_post_by_id"
+
+
+def test_slow_read_is_skipped_while_explain_is_in_flight():
+    started, release = threading.Event(), threading.Event()
+    explained = []
+
+    def explain(name, query, params):
+        explained.append(name)
+        started.set()
+        release.wait(5)
+        tracing._explain_slot.release()
+
+    skipped = tracing._counters["explains_skipped"]
+    with patch.object(tracing, "SLOW_QUERY_EXPLAIN_RATE", 1.0), \
+         patch.object(tracing, "_explain_slot", threading.Semaphore(1)), \
+         patch.object(tracing, "_explain", explain):
+        tracing.record_query("first", "SELECT 1", None, 0.5)
+        assert started.wait(5)
+        tracing.record_query("second", "SELECT 2", None, 0.5)
+        release.set()
+        tracing._explainer.submit(lambda: None).result(5)
+
+    assert explained == ["first"]
+    assert tracing._counters["explains_skipped"] == skipped + 1
+
+
+def test_slow_query_params_with_password_hash_are_redacted(caplog):
+    from repositories import user_queries
+
+    with caplog.at_level(logging.WARNING, logger="utils.tracing"):
+        tracing.record_query("user_repository.create_user", user_queries.CREATE_USER,
+                             ("john", "John", None, "$2b$12$secrethash"), 0.5)
+
+    assert "$2b$12$secrethash" not in caplog.text
+    assert "params: <redacted: str, str, NoneType, str>" in caplog.text
+
+
+def test_is_read():
+    assert tracing.is_read("  with t as (select 1) select * from t")
+    assert not tracing.is_read("WITH d AS (DELETE FROM likes RETURNING *) SELECT 1")
+    assert not tracing.is_read("INSERT INTO views VALUES (1, 2)")
+
+
+def test_response_has_server_timing_header():
+    def get_user_by_id(user_id):
+        tracing.record_query("user_repository.get_user_by_id", "SELECT 1", (user_id,), 0.004)
+        return {"id": user_id, "user_name": "user5", "first_name": None, "last_name": None, "status": 1}
+
+    with patch("controllers.user_controller.get_user_by_id", side_effect=get_user_by_id):
+        res = client.get("/api/users/5")
+
+    assert res.status_code == 200
+    timing = res.headers["server-timing"]
+    assert timing.startswith('db;dur=4.00;desc="1 queries", pool;dur=0.00')
+    assert 'slowest;dur=4.00;desc="user_repository.get_user_by_id"' in timing
+    assert "app;dur=" in timing
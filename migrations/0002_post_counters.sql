@@ -0,0 +1,23 @@
+ALTER TABLE posts
+    ADD COLUMN likes_count integer NOT NULL DEFAULT 0,
+    ADD COLUMN views_count integer NOT NULL DEFAULT 0,
+    ADD COLUMN replies_count integer NOT NULL DEFAULT 0;
+
+UPDATE posts p
+SET likes_count = COALESCE(lc.likes_count, 0),
+    views_count = COALESCE(vc.views_count, 0),
+    replies_count = COALESCE(rc.replies_count, 0)
+FROM posts src
+LEFT JOIN (
+    SELECT post_id, COUNT(*) AS likes_count
+    FROM likes GROUP BY post_id
+) lc ON lc.post_id = src.id
+LEFT JOIN (
+    SELECT post_id, COUNT(*) AS views_count
+    FROM views GROUP BY post_id
+) vc ON vc.post_id = src.id
+LEFT JOIN (
+    SELECT reply_to_id, COUNT(*) AS replies_count
+    FROM posts WHERE reply_to_id IS NOT NULL AND deleted_at IS NULL GROUP BY reply_to_id
+) rc ON rc.reply_to_id = src.id
+WHERE p.id = src.id;
@@ -0,0 +1,6 @@
+-- 'simple' без стемминга: в постах смешаны русский и английский
+ALTER TABLE posts
+    ADD COLUMN text_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', COALESCE(text, ''))) STORED;
+
+CREATE INDEX posts_text_tsv_idx ON posts USING GIN (text_tsv);
@@ -0,0 +1,22 @@
+-- migrate: no-transaction
+-- индексы повторяют предикаты и сортировки из repositories/post_queries.py
+
+-- лента: WHERE deleted_at IS NULL AND reply_to_id IS NULL ORDER BY created_at DESC, id DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS posts_feed_idx
+    ON posts (created_at DESC, id DESC)
+    WHERE deleted_at IS NULL AND reply_to_id IS NULL;
+
+-- ветка ответов: WHERE reply_to_id = %s AND deleted_at IS NULL ORDER BY created_at, id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS posts_reply_to_id_created_at_idx
+    ON posts (reply_to_id, created_at, id)
+    WHERE deleted_at IS NULL;
+
+-- посты автора: WHERE user_id = %s AND deleted_at IS NULL ORDER BY created_at DESC, id DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS posts_user_id_created_at_idx
+    ON posts (user_id, created_at DESC, id DESC)
+    WHERE deleted_at IS NULL;
+
+-- PK (user_id, post_id) не помогает при поиске по post_id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS likes_post_id_idx ON likes (post_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS views_post_id_idx ON views (post_id);
@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- справочник пользователей: WHERE deleted_at IS NULL [AND id > %s] ORDER BY id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_active_id_idx
+    ON users (id)
+    WHERE deleted_at IS NULL;
@@ -1,17 +1,52 @@
 import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Response, status
+from fastapi import FastAPI, Header, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from config.db import pool
-from controllers.auth_controller import router as auth_router
-from controllers.post_controller import router as post_router
-from controllers.user_controller import router as user_router
+from config.db import DB_MODE, POOL_TIMEOUT, async_pool, pool
+from services.view_buffer import VIEW_BUFFER_ENABLED, view_buffer
+from middleware.metrics import MetricsMiddleware
+from middleware.profiling import ProfilingMiddleware
+from middleware.tracing import TracingMiddleware
+from utils import metrics, profiling, stats
 
+if DB_MODE == "async":
+    from controllers.async_auth_controller import router as auth_router
+    from controllers.async_post_controller import router as post_router
+    from controllers.async_user_controller import router as user_router
+else:
+    from controllers.auth_controller import router as auth_router
+    from controllers.post_controller import router as post_router
+    from controllers.user_controller import router as user_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # wait=True: старт только после того, как пул наберёт min_size соединений
+    if DB_MODE == "async":
+        await async_pool.open(wait=True, timeout=POOL_TIMEOUT)
+    # буфер просмотров пишет через синхронный пул из своего потока
+    if DB_MODE != "async" or VIEW_BUFFER_ENABLED:
+        pool.open(wait=True, timeout=POOL_TIMEOUT)
+    if VIEW_BUFFER_ENABLED:
+        view_buffer.start()
+    yield
+    if VIEW_BUFFER_ENABLED:
+        view_buffer.stop()
+    if DB_MODE == "async":
+        await async_pool.close()
+    if DB_MODE != "async" or VIEW_BUFFER_ENABLED:
+        pool.close()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.include_router(auth_router, prefix="/api")
 app.include_router(user_router, prefix='/api')
 app.include_router(post_router, prefix='/api')
@@ -19,16 +54,52 @@ app.include_router(post_router, prefix='/api')
 port = int(os.getenv("PORT", 3000))
 
 
-@app.get("/api/health-check")
-def health_check():
-    try:
-        with pool.connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1")
-                cur.fetchone()
-        return Response(content="OK", status_code=status.HTTP_200_OK)
-    except Exception:
-        return Response(content="DB connection failed", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+if DB_MODE == "async":
+    @app.get("/api/health-check")
+    async def health_check():
+        try:
+            async with async_pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SELECT 1")
+                    await cur.fetchone()
+            return Response(content="OK", status_code=status.HTTP_200_OK)
+        except Exception:
+            return Response(content="DB connection failed", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+else:
+    @app.get("/api/health-check")
+    def health_check():
+        try:
+            with pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                    cur.fetchone()
+            return Response(content="OK", status_code=status.HTTP_200_OK)
+        except Exception:
+            return Response(content="DB connection failed", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@app.get("/api/stats")
+def get_stats():
+    return stats.collect()
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/debug/profile", include_in_schema=False)
+def get_profile(route: str | None = None, x_profile: str | None = Header(None)):
+    if not profiling.authorized(x_profile):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return PlainTextResponse(profiling.collapsed(route))
+
+
+@app.delete("/debug/profile", include_in_schema=False, status_code=status.HTTP_204_NO_CONTENT)
+def reset_profile(x_profile: str | None = Header(None)):
+    if not profiling.authorized(x_profile):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    profiling.reset()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,123 @@
 import os
-from psycopg_pool import ConnectionPool
+import time
 
+from psycopg import AsyncCursor, Cursor
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
-pool = ConnectionPool(
-    conninfo=f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
-             f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+from utils import metrics, stats, tracing
+
+
+DB_MODE = os.getenv("DB_MODE", "sync")  # sync | async
+
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "4"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", str(POOL_MIN_SIZE)))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))                # ожидание свободного соединения, сек
+POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "600"))             # простой сверх min_size, сек
+POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "3600"))    # время жизни соединения, сек
+POOL_CHECK = os.getenv("DB_POOL_CHECK", "false").lower() == "true"      # проверять соединение перед выдачей
+
+# запрос готовится на сервере (PREPARE) после стольких выполнений на соединении; 0 - сразу, "none" - никогда
+# (нужно за PgBouncer в transaction pooling до 1.21)
+_prepare_threshold = os.getenv("DB_PREPARE_THRESHOLD", "5").lower()
+PREPARE_THRESHOLD = None if _prepare_threshold in ("", "none") else int(_prepare_threshold)
+PREPARED_MAX = int(os.getenv("DB_PREPARED_MAX", "100"))  # сколько подготовленных запросов держит соединение
+
+conninfo = (
+    f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+    f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
 )
+
+pool_options = {
+    "min_size": POOL_MIN_SIZE,
+    "max_size": POOL_MAX_SIZE,
+    "timeout": POOL_TIMEOUT,
+    "max_idle": POOL_MAX_IDLE,
+    "max_lifetime": POOL_MAX_LIFETIME,
+}
+
+
+class TimedCursor(Cursor):
+    def execute(self, query, params=None, **kwargs):
+        caller = tracing.caller_name()
+        started = time.perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.db_query.observe(elapsed, metrics.query_name(query))
+            tracing.record_query(caller, query, params, elapsed)
+
+
+class TimedAsyncCursor(AsyncCursor):
+    async def execute(self, query, params=None, **kwargs):
+        # до первого await кадр вызывающей корутины ещё на стеке
+        caller = tracing.caller_name()
+        started = time.perf_counter()
+        try:
+            return await super().execute(query, params, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.db_query.observe(elapsed, metrics.query_name(query))
+            tracing.record_query(caller, query, params, elapsed)
+
+
+class TimedConnectionPool(ConnectionPool):
+    # pool.connection() берёт соединение через getconn: здесь видно ожидание свободного соединения
+    def getconn(self, timeout=None):
+        started = time.perf_counter()
+        try:
+            return super().getconn(timeout)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.db_pool_wait.observe(elapsed)
+            tracing.record_pool_wait(elapsed)
+
+
+class TimedAsyncConnectionPool(AsyncConnectionPool):
+    async def getconn(self, timeout=None):
+        started = time.perf_counter()
+        try:
+            return await super().getconn(timeout)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.db_pool_wait.observe(elapsed)
+            tracing.record_pool_wait(elapsed)
+
+
+def configure_connection(conn) -> None:
+    conn.prepared_max = PREPARED_MAX
+
+
+async def configure_async_connection(conn) -> None:
+    conn.prepared_max = PREPARED_MAX
+
+# оба пула открываются в lifespan приложения (или явно в скриптах через `with pool:`)
+pool = TimedConnectionPool(
+    conninfo=conninfo,
+    open=False,
+    check=ConnectionPool.check_connection if POOL_CHECK else None,
+    configure=configure_connection,
+    kwargs={"prepare_threshold": PREPARE_THRESHOLD, "cursor_factory": TimedCursor},
+    **pool_options,
+)
+async_pool = TimedAsyncConnectionPool(
+    conninfo=conninfo,
+    open=False,
+    check=AsyncConnectionPool.check_connection if POOL_CHECK else None,
+    configure=configure_async_connection,
+    kwargs={"prepare_threshold": PREPARE_THRESHOLD, "cursor_factory": TimedAsyncCursor},
+    **pool_options,
+)
+
+
+def pool_stats() -> dict:
+    active_pool = async_pool if DB_MODE == "async" else pool
+    result = active_pool.get_stats()
+    result["connections_in_use"] = result.get("pool_size", 0) - result.get("pool_available", 0)
+    result["requests_wait_avg_ms"] = (
+        result.get("requests_wait_ms", 0) / result["requests_num"] if result.get("requests_num") else 0
+    )
+    return result
+
+
+stats.register("pool", pool_stats)
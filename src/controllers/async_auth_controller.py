@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Request, status
+
+from dto.auth_dto import LoginDTO, RegisterDTO
+from services.async_auth_service import login as login_service, register as register_service
+from services.auth_service import refresh as refresh_service
+from utils.hashing import HashingOverloadedError
+
+router = APIRouter(prefix="/auth", tags=["Auth"])
+
+
+@router.post("/login")
+async def login(dto: LoginDTO):
+    try:
+        tokens = await login_service(dto.model_dump())
+        return tokens
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
+
+@router.post("/register", status_code=201)
+async def register(dto: RegisterDTO):
+    try:
+        tokens = await register_service(dto.model_dump())
+        return tokens
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
+
+@router.post("/refresh")
+async def refresh(request: Request):
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing token")
+
+    token = auth_header[7:]  # убираем "Bearer "
+
+    try:
+        tokens = refresh_service(token)
+        return tokens
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
@@ -0,0 +1,117 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+
+from services.async_post_service import (
+    get_all_posts,
+    get_posts_by_ids,
+    create_post,
+    delete_post,
+    view_post,
+    view_posts,
+    like_post,
+    dislike_post,
+)
+from dto.post_dto import (
+    DetailedPostReadDTO,
+    PostBatchReadDTO,
+    PostCreateDTO,
+    PostReadDTO,
+    PostFilterDTO,
+    PostViewBatchDTO,
+    PostViewBatchReadDTO,
+)
+from dependencies.auth import get_current_user, TokenPayload
+from utils.pagination import next_cursor, parse_ids
+from utils.responses import TrustedJSONResponse
+
+
+router = APIRouter(prefix="/posts", tags=["Posts"])
+
+
+@router.get("/", response_model=List[DetailedPostReadDTO])
+async def get_all_posts_handler(
+    limit: int = Query(10, gt=0),
+    offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
+    reply_to_id: int = Query(None, gt=0),
+    owner_id: int = Query(0),
+    search: str = Query(""),
+    user: TokenPayload = Depends(get_current_user),
+):
+    try:
+        filter_dto = PostFilterDTO(
+            user_id=user.sub,
+            limit=limit,
+            offset=offset,
+            reply_to_id=reply_to_id,
+            owner_id=owner_id,
+            search=search,
+            cursor=cursor,
+        )
+        posts = await get_all_posts(filter_dto.model_dump())
+        next_page = next_cursor(posts, limit)
+        # строки уже в форме DetailedPostReadDTO (detailed_post_row) - без повторной валидации
+        return TrustedJSONResponse(posts, headers={"X-Next-Cursor": next_page} if next_page else None)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/batch", response_model=PostBatchReadDTO)
+async def get_posts_batch_handler(
+    ids: str = Query(..., description="Comma-separated post ids, e.g. 3,1,2"),
+    user: TokenPayload = Depends(get_current_user),
+):
+    try:
+        return TrustedJSONResponse(await get_posts_by_ids(parse_ids(ids), user.sub))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/", response_model=PostReadDTO, status_code=status.HTTP_201_CREATED)
+async def create_post_handler(dto: PostCreateDTO, user: TokenPayload = Depends(get_current_user)):
+    try:
+        dto.user_id = user.sub
+        return await create_post(dto.model_dump())
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_post_handler(post_id: int = Path(..., gt=0), user: TokenPayload = Depends(get_current_user)):
+    try:
+        await delete_post(post_id, user.sub)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post("/views", response_model=PostViewBatchReadDTO)
+async def view_posts_handler(dto: PostViewBatchDTO, user: TokenPayload = Depends(get_current_user)):
+    try:
+        return {"viewed": await view_posts(dto.post_ids, user.sub)}
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{post_id}/view", status_code=status.HTTP_201_CREATED)
+async def view_post_handler(post_id: int = Path(..., gt=0), user: TokenPayload = Depends(get_current_user)):
+    try:
+        await view_post(post_id, user.sub)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post("/{post_id}/like", status_code=status.HTTP_201_CREATED)
+async def like_post_handler(post_id: int = Path(..., gt=0), user: TokenPayload = Depends(get_current_user)):
+    try:
+        await like_post(post_id, user.sub)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.delete("/{post_id}/like", status_code=status.HTTP_204_NO_CONTENT)
+async def dislike_post_handler(post_id: int = Path(..., gt=0), user: TokenPayload = Depends(get_current_user)):
+    try:
+        await dislike_post(post_id, user.sub)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
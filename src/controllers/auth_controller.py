@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Request, status
 
 from dto.auth_dto import LoginDTO, RefreshDTO, RegisterDTO
 from services.auth_service import login as login_service, register as register_service, refresh as refresh_service
+from utils.hashing import HashingOverloadedError
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -11,6 +12,8 @@ def login(dto: LoginDTO):
     try:
         tokens = login_service(dto.model_dump())
         return tokens
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
@@ -20,6 +23,8 @@ def register(dto: RegisterDTO):
     try:
         tokens = register_service(dto.model_dump())
         return tokens
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
@@ -2,21 +2,48 @@ from typing import List
 
 from fastapi import APIRouter, HTTPException, Query, Path, status
 
-from dto.user_dto import UpdateUserDTO, ReadUserDTO
+from dto.user_dto import UpdateUserDTO, ReadUserDTO, UserBatchReadDTO
 from services.user_service import (
+    estimate_users_count,
     get_all_users,
     get_user_by_id,
+    get_users_by_ids,
     update_user,
     delete_user,
 )
+from utils.hashing import HashingOverloadedError
+from utils.pagination import next_id_cursor, parse_ids
+from utils.responses import TrustedJSONResponse
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/", response_model=List[ReadUserDTO])
-def get_all(limit: int = Query(10, ge=1), offset: int = Query(0, ge=0)):
+def get_all(
+    limit: int = Query(10, ge=1),
+    offset: int = Query(0, ge=0),
+    cursor: str = Query(None),
+    with_total: bool = Query(False),
+):
     try:
-        return get_all_users(limit, offset)
+        # GET_ALL_USERS выбирает ровно поля ReadUserDTO
+        users = get_all_users(limit, offset, cursor)
+        headers = {}
+        next_page = next_id_cursor(users, limit)
+        if next_page:
+            headers["X-Next-Cursor"] = next_page
+        if with_total:
+            headers["X-Total-Count-Estimate"] = str(estimate_users_count())
+        return TrustedJSONResponse(users, headers=headers or None)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# объявлен до /{user_id}: иначе "batch" разбирался бы как user_id
+@router.get("/batch", response_model=UserBatchReadDTO)
+def get_batch(ids: str = Query(..., description="Comma-separated user ids, e.g. 3,1,2")):
+    try:
+        return TrustedJSONResponse(get_users_by_ids(parse_ids(ids)))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -33,6 +60,8 @@ def get_by_id(user_id: int = Path(..., gt=0)):
 def update_by_id(user_id: int, dto: UpdateUserDTO):
     try:
         return update_user(user_id, dto.model_dump())
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -1,10 +1,18 @@
+import hashlib
+import time
+
 from fastapi import Depends, HTTPException, Request
 from jose import jwt, JWTError
 from pydantic import BaseModel
 from os import getenv
 
+from utils import metrics, stats
+from utils.cache import TTLCache
+
 ACCESS_TOKEN_SECRET = getenv("ACCESS_TOKEN_SECRET")
 ALGORITHM = getenv("ALGORITHM")
+TOKEN_CACHE_SIZE = int(getenv("TOKEN_CACHE_SIZE", "10000"))  # 0 - кэш выключен
+TOKEN_CACHE_TTL = float(getenv("TOKEN_CACHE_TTL", "300"))
 
 
 class TokenPayload(BaseModel):
@@ -12,23 +20,36 @@ class TokenPayload(BaseModel):
     exp: int  # время жизни токена
 
 
-def get_current_user(request: Request) -> TokenPayload:
+# ключ - sha256 токена, значение - проверенный TokenPayload; запись живёт не дольше exp токена
+token_cache = TTLCache(max_size=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+stats.register("token_cache", token_cache.stats)
+
+
+# async: FastAPI вызывает sync-зависимости через пул потоков, а здесь нет блокирующего I/O -
+# на async-маршрутах это лишний переход в поток на каждый запрос
+async def get_current_user(request: Request) -> TokenPayload:
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing token")
 
     token = auth_header[7:]  # убираем "Bearer "
+    cache_key = hashlib.sha256(token.encode()).digest()
+
+    user = token_cache.get(cache_key, None)
+    if user is None:
+        try:
+            with metrics.auth_jwt.time("decode"):
+                payload = jwt.decode(token, ACCESS_TOKEN_SECRET, algorithms=[ALGORITHM])
+            user = TokenPayload(**payload)
+        except JWTError as e:
+            raise HTTPException(status_code=401, detail=str(e))
+        token_cache.set(cache_key, user, ttl=user.exp - time.time())
 
-    try:
-        payload = jwt.decode(token, ACCESS_TOKEN_SECRET, algorithms=[ALGORITHM])
-        user = TokenPayload(**payload)
-        request.state.user = user
-        return user
-    except JWTError as e:
-        raise HTTPException(status_code=401, detail=str(e))
+    request.state.user = user
+    return user
 
 
-def verify_same_user(user_id: int, token: TokenPayload = Depends(get_current_user)):
+async def verify_same_user(user_id: int, token: TokenPayload = Depends(get_current_user)):
     if token.sub != int(user_id):
         raise HTTPException(status_code=401, detail="Forbidden")
     return token
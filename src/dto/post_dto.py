@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PositiveInt
 
 
 class PostCreateDTO(BaseModel):
@@ -17,6 +17,15 @@ class PostFilterDTO(BaseModel):
     reply_to_id: Optional[int] = Field(None, gt=0)
     limit: Optional[int] = Field(None, gt=0)
     offset: Optional[int] = Field(None, ge=0)
+    cursor: Optional[str] = None
+
+
+class PostViewBatchDTO(BaseModel):
+    post_ids: List[PositiveInt] = Field(..., min_length=1, max_length=100)
+
+
+class PostViewBatchReadDTO(BaseModel):
+    viewed: List[int]
 
 
 class PostReadDTO(BaseModel):
@@ -43,4 +52,9 @@ class DetailedPostReadDTO(BaseModel):
     replies_count: int
     user_liked: bool
     user_viewed: bool
-    user: PostUserDTO
\ No newline at end of file
+    user: PostUserDTO
+
+
+class PostBatchReadDTO(BaseModel):
+    posts: List[DetailedPostReadDTO]
+    missing: List[int]
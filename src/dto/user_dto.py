@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 import regex as re
@@ -64,3 +64,8 @@ class ReadUserDTO(BaseModel):
     first_name: Optional[str]
     last_name: Optional[str]
     status: int
+
+
+class UserBatchReadDTO(BaseModel):
+    users: List[ReadUserDTO]
+    missing: List[int]
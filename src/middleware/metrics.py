@@ -0,0 +1,35 @@
+import time
+
+from utils import metrics
+
+
+class MetricsMiddleware:
+    """Чистый ASGI middleware: гистограмма по шаблону маршрута ("/api/posts/{post_id}/like"), а не по URL."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.http_in_flight.dec()
+            # маршрут FastAPI кладёт в scope при сопоставлении; без него - 404 и т.п., одной меткой
+            route = scope.get("route")
+            metrics.http_requests.observe(
+                time.perf_counter() - started, scope["method"], getattr(route, "path", "unmatched"), status,
+            )
@@ -0,0 +1,28 @@
+import sys
+
+from utils import profiling
+
+
+class ProfilingMiddleware:
+    """Профилирует запросы с заголовком X-Profile (равным PROFILE_TOKEN) или долю PROFILE_SAMPLE_RATE."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/debug/") or not profiling.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # кадр этого вызова есть на стеке цикла событий, только пока исполняется код этого запроса
+        sampler = profiling.start(sys._getframe())
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = profiling.current_sampler.set(sampler)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiling.current_sampler.reset(token)
+            sampler.stop(getattr(scope.get("route"), "path", "unmatched"))
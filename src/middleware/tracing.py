@@ -0,0 +1,30 @@
+import time
+
+from utils import tracing
+
+
+class TracingMiddleware:
+    """Собирает по запросу число запросов к БД, время в БД и ожидание пула; отдаёт их в Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = tracing.RequestTrace()
+        token = tracing.current_trace.set(trace)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and tracing.SERVER_TIMING:
+                header = trace.server_timing(time.perf_counter() - started).encode("latin-1", "replace")
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            tracing.current_trace.reset(token)
@@ -0,0 +1,109 @@
+from psycopg.errors import UniqueViolation
+from psycopg.rows import dict_row
+
+from config.db import async_pool
+from repositories import post_queries
+
+
+async def create_post(dto: dict) -> dict:
+    values = (
+        dto["text"],
+        dto["user_id"],
+        dto.get("reply_to_id"),
+    )
+
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(post_queries.CREATE_POST, values)
+            return await cur.fetchone()
+
+
+async def get_all_posts(dto: dict) -> list[dict]:
+    query, params = post_queries.get_all_posts_query(dto)
+
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=post_queries.detailed_post_row) as cur:
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+
+async def get_post_by_id(post_id: int, user_id: int) -> dict:
+    params = (user_id, user_id, post_id)
+
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=post_queries.detailed_post_row) as cur:
+            await cur.execute(post_queries.GET_POST_BY_ID, params)
+            row = await cur.fetchone()
+
+            if row is None:
+                raise ValueError("Post not found")
+
+            return row
+
+
+async def get_posts_by_ids(post_ids: list[int], user_id: int) -> list[dict]:
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=post_queries.detailed_post_row) as cur:
+            await cur.execute(post_queries.GET_POSTS_BY_IDS, (user_id, user_id, post_ids))
+            by_id = {row["id"]: row for row in await cur.fetchall()}
+
+    # в порядке запроса; отсутствующие и удалённые посты пропускаются
+    return [by_id[post_id] for post_id in dict.fromkeys(post_ids) if post_id in by_id]
+
+
+async def get_user_post_flags(post_ids: list[int], user_id: int) -> dict[int, tuple[bool, bool]]:
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(post_queries.GET_USER_POST_FLAGS, (user_id, user_id, post_ids))
+            return {post_id: (liked, viewed) for post_id, liked, viewed in await cur.fetchall()}
+
+
+async def delete_post(post_id: int, owner_id: int) -> None:
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(post_queries.DELETE_POST, (post_id, owner_id))
+            if cur.rowcount == 0:
+                raise ValueError("Post not found or already deleted")
+
+
+async def view_post(post_id: int, user_id: int) -> None:
+    try:
+        async with async_pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(post_queries.VIEW_POST, (post_id, user_id))
+                if cur.rowcount == 0:
+                    raise ValueError("Post not found")
+    except UniqueViolation as err:
+        if "views_user_id_post_id_pkey" in str(err):
+            raise ValueError("Post already viewed") from err
+        raise
+
+
+async def view_posts(post_ids: list[int], user_id: int) -> list[int]:
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(post_queries.VIEW_POSTS, (user_id, post_ids))
+            viewed = {row[0] for row in await cur.fetchall()}
+
+    return [post_id for post_id in dict.fromkeys(post_ids) if post_id in viewed]
+
+
+async def like_post(post_id: int, user_id: int) -> None:
+    try:
+        async with async_pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(post_queries.LIKE_POST, (post_id, user_id))
+                if cur.rowcount == 0:
+                    raise ValueError("Post not found")
+    except UniqueViolation as err:
+        if "likes_user_id_post_id_pkey" in str(err):
+            raise ValueError("Post already liked") from err
+        raise
+
+
+async def dislike_post(post_id: int, user_id: int) -> None:
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(post_queries.DISLIKE_POST, (post_id, user_id))
+            if cur.rowcount == 0:
+                raise ValueError("Post not found")
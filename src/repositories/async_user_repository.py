@@ -0,0 +1,89 @@
+from config.db import async_pool
+from psycopg.rows import dict_row
+
+from repositories import user_queries
+
+
+async def create_user(dto: dict) -> dict:
+    values = (
+        dto["user_name"],
+        dto["first_name"],
+        dto["last_name"],
+        dto["password_hash"],
+    )
+
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(user_queries.CREATE_USER, values)
+            return await cur.fetchone()
+
+
+async def get_all_users(limit: int, offset: int, after_id: int | None = None) -> list[dict]:
+    query, params = user_queries.get_all_users_query(limit, offset, after_id)
+
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+
+async def estimate_users_count() -> int:
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(user_queries.ESTIMATE_USERS_COUNT)
+            row = await cur.fetchone()
+            return row[0] if row else 0
+
+
+async def get_user_by_id(user_id: int) -> dict:
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(user_queries.GET_USER_BY_ID, (user_id,))
+            result = await cur.fetchone()
+
+            if result is None:
+                raise ValueError("User not found")
+
+            return result
+
+
+async def get_users_by_ids(user_ids: list[int]) -> list[dict]:
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(user_queries.GET_USERS_BY_IDS, (user_ids,))
+            by_id = {row["id"]: row for row in await cur.fetchall()}
+
+    return [by_id[user_id] for user_id in dict.fromkeys(user_ids) if user_id in by_id]
+
+
+async def get_user_by_username(user_name: str) -> dict:
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(user_queries.GET_USER_BY_USERNAME, (user_name,))
+            result = await cur.fetchone()
+
+            if result is None:
+                raise ValueError("User not found")
+            return result
+
+
+async def update_user(user_id: int, dto: dict) -> dict:
+    query, values = user_queries.update_user_query(user_id, dto)
+
+    async with async_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query, values)
+            result = await cur.fetchone()
+
+            if result is None:
+                raise ValueError("User not found")
+
+            return result
+
+
+async def delete_user(user_id: int) -> None:
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(user_queries.DELETE_USER, (user_id,))
+            if cur.rowcount == 0:
+                raise ValueError("User not found")
@@ -0,0 +1,297 @@
+import re
+from datetime import datetime, timezone
+from typing import Callable, Sequence
+
+from utils import metrics
+
+
+CREATE_POST = """
+    WITH post AS (
+        INSERT INTO posts (text, user_id, reply_to_id)
+        VALUES (%s, %s, %s)
+        RETURNING id, text, created_at, reply_to_id
+    ),
+    parent AS (
+        UPDATE posts SET replies_count = replies_count + 1
+        WHERE id = (SELECT reply_to_id FROM post)
+    )
+    SELECT id, text, created_at, reply_to_id FROM post;
+"""
+
+# двухфазный запрос: {page} выбирает только id постов страницы (по индексу, часто index-only),
+# а авторы, счётчики и флаги пользователя добираются уже для этих id
+GET_ALL_POSTS = """
+    SELECT
+        p.id, p.text, p.reply_to_id, p.created_at,
+        u.id AS user_id, u.user_name, u.first_name, u.last_name,
+        p.likes_count, p.views_count, p.replies_count,
+        EXISTS (SELECT 1 FROM likes l WHERE l.user_id = %s AND l.post_id = p.id) AS user_liked,
+        EXISTS (SELECT 1 FROM views v WHERE v.user_id = %s AND v.post_id = p.id) AS user_viewed
+    FROM ({page}) page
+    JOIN posts p ON p.id = page.id
+    JOIN users u ON u.id = p.user_id
+    ORDER BY {order_by}
+"""
+
+GET_POST_BY_ID = """
+    SELECT
+        p.id AS post_id,
+        p.text,
+        p.reply_to_id,
+        p.created_at,
+        u.id AS user_id,
+        u.user_name,
+        u.first_name,
+        u.last_name,
+        p.likes_count,
+        p.views_count,
+        p.replies_count,
+        EXISTS (SELECT 1 FROM likes l WHERE l.user_id = %s AND l.post_id = p.id) AS user_liked,
+        EXISTS (SELECT 1 FROM views v WHERE v.user_id = %s AND v.post_id = p.id) AS user_viewed
+    FROM posts p
+    JOIN users u ON u.id = p.user_id
+    WHERE p.id = %s AND p.deleted_at IS NULL;
+"""
+
+GET_POSTS_BY_IDS = """
+    SELECT
+        p.id AS post_id,
+        p.text,
+        p.reply_to_id,
+        p.created_at,
+        u.id AS user_id,
+        u.user_name,
+        u.first_name,
+        u.last_name,
+        p.likes_count,
+        p.views_count,
+        p.replies_count,
+        EXISTS (SELECT 1 FROM likes l WHERE l.user_id = %s AND l.post_id = p.id) AS user_liked,
+        EXISTS (SELECT 1 FROM views v WHERE v.user_id = %s AND v.post_id = p.id) AS user_viewed
+    FROM posts p
+    JOIN users u ON u.id = p.user_id
+    WHERE p.id = ANY(%s) AND p.deleted_at IS NULL;
+"""
+
+GET_USER_POST_FLAGS = """
+    SELECT
+        p.id,
+        EXISTS (SELECT 1 FROM likes l WHERE l.user_id = %s AND l.post_id = p.id) AS user_liked,
+        EXISTS (SELECT 1 FROM views v WHERE v.user_id = %s AND v.post_id = p.id) AS user_viewed
+    FROM unnest(%s::bigint[]) AS p(id);
+"""
+
+DELETE_POST = """
+    WITH post AS (
+        UPDATE posts
+        SET deleted_at = now()
+        WHERE id = %s AND user_id = %s AND deleted_at IS NULL
+        RETURNING id, reply_to_id
+    ),
+    parent AS (
+        UPDATE posts SET replies_count = replies_count - 1
+        WHERE id = (SELECT reply_to_id FROM post)
+    )
+    SELECT id FROM post;
+"""
+
+VIEW_POST = """
+    WITH view AS (
+        INSERT INTO views (post_id, user_id)
+        VALUES (%s, %s)
+        RETURNING post_id
+    )
+    UPDATE posts SET views_count = views_count + 1
+    WHERE id = (SELECT post_id FROM view)
+    RETURNING id;
+"""
+
+VIEW_POSTS = """
+    WITH viewed AS (
+        INSERT INTO views (post_id, user_id)
+        SELECT p.id, %s
+        FROM posts p
+        WHERE p.id = ANY(%s) AND p.deleted_at IS NULL
+        ON CONFLICT DO NOTHING
+        RETURNING post_id
+    ),
+    counters AS (
+        UPDATE posts SET views_count = views_count + 1
+        WHERE id IN (SELECT post_id FROM viewed)
+    )
+    SELECT post_id FROM viewed;
+"""
+
+RECORD_VIEWS = """
+    WITH viewed AS (
+        INSERT INTO views (user_id, post_id)
+        SELECT v.user_id, v.post_id
+        FROM unnest(%s::bigint[], %s::bigint[]) AS v(user_id, post_id)
+        JOIN posts p ON p.id = v.post_id AND p.deleted_at IS NULL
+        ON CONFLICT DO NOTHING
+        RETURNING post_id
+    ),
+    counters AS (
+        UPDATE posts p SET views_count = p.views_count + c.views
+        FROM (SELECT post_id, COUNT(*) AS views FROM viewed GROUP BY post_id) c
+        WHERE p.id = c.post_id
+    )
+    SELECT COUNT(*) FROM viewed;
+"""
+
+LIKE_POST = """
+    WITH liked AS (
+        INSERT INTO likes (post_id, user_id)
+        VALUES (%s, %s)
+        RETURNING post_id
+    )
+    UPDATE posts SET likes_count = likes_count + 1
+    WHERE id = (SELECT post_id FROM liked)
+    RETURNING id;
+"""
+
+DISLIKE_POST = """
+    WITH disliked AS (
+        DELETE FROM likes
+        WHERE post_id = %s AND user_id = %s
+        RETURNING post_id
+    )
+    UPDATE posts SET likes_count = likes_count - 1
+    WHERE id = (SELECT post_id FROM disliked)
+    RETURNING id;
+"""
+
+RECONCILE_COUNTERS = """
+    WITH counters AS (
+        SELECT
+            p.id,
+            COALESCE(lc.likes_count, 0) AS likes_count,
+            COALESCE(vc.views_count, 0) AS views_count,
+            COALESCE(rc.replies_count, 0) AS replies_count
+        FROM posts p
+        LEFT JOIN (
+            SELECT post_id, COUNT(*) AS likes_count
+            FROM likes GROUP BY post_id
+        ) lc ON lc.post_id = p.id
+        LEFT JOIN (
+            SELECT post_id, COUNT(*) AS views_count
+            FROM views GROUP BY post_id
+        ) vc ON vc.post_id = p.id
+        LEFT JOIN (
+            SELECT reply_to_id, COUNT(*) AS replies_count
+            FROM posts WHERE reply_to_id IS NOT NULL AND deleted_at IS NULL GROUP BY reply_to_id
+        ) rc ON rc.reply_to_id = p.id
+    )
+    UPDATE posts p
+    SET likes_count = c.likes_count,
+        views_count = c.views_count,
+        replies_count = c.replies_count
+    FROM counters c
+    WHERE p.id = c.id
+      AND (p.likes_count, p.views_count, p.replies_count)
+          IS DISTINCT FROM (c.likes_count, c.views_count, c.replies_count);
+"""
+
+
+def to_prefix_tsquery(search: str | None) -> str | None:
+    # каждое слово ищется по префиксу: "go lang" -> "go:* & lang:*"
+    words = re.findall(r"[^\W_]+", (search or "").lower())
+    return " & ".join(f"{word}:*" for word in words) or None
+
+
+def _feed_query(search: bool, owner: bool, thread: bool) -> str:
+    page = "SELECT p.id FROM posts p WHERE p.deleted_at IS NULL"
+    if search:
+        page += " AND p.text_tsv @@ to_tsquery('simple', %s)"
+    if owner:
+        page += " AND p.user_id = %s"
+    if thread:
+        # ответы в треде - от старых к новым
+        page += " AND p.reply_to_id = %s AND (p.created_at, p.id) > (%s, %s)"
+        order_by = "p.created_at ASC, p.id ASC"
+    else:
+        page += " AND p.reply_to_id IS NULL AND (p.created_at, p.id) < (%s, %s)"
+        order_by = "p.created_at DESC, p.id DESC"
+    page += f" ORDER BY {order_by} OFFSET %s LIMIT %s"
+    return GET_ALL_POSTS.format(page=page, order_by=order_by)
+
+
+# фиксированный набор текстов запроса ленты (поиск x автор x тред), чтобы psycopg
+# готовил их на сервере (prepared statements) и не разбирал/планировал каждый раз заново.
+# Условие по курсору есть всегда: без курсора подставляется граница, которую проходят все строки.
+FEED_QUERIES = {
+    (search, owner, thread): _feed_query(search, owner, thread)
+    for search in (False, True)
+    for owner in (False, True)
+    for thread in (False, True)
+}
+
+for (search, owner, thread), text in FEED_QUERIES.items():
+    flags = [flag for flag, on in (("search", search), ("owner", owner), ("thread", thread)) if on]
+    metrics.name_query(text, f"post_queries.feed[{','.join(flags)}]")
+
+FEED_START = (datetime.max.replace(tzinfo=timezone.utc), 2 ** 63 - 1)
+THREAD_START = (datetime.min.replace(tzinfo=timezone.utc), 0)
+
+
+def get_all_posts_query(dto: dict) -> tuple[str, list]:
+    params = [dto["user_id"], dto["user_id"]]
+
+    search_query = to_prefix_tsquery(dto.get("search"))
+    if search_query:
+        params.append(search_query)
+    if dto.get("owner_id"):
+        params.append(dto["owner_id"])
+
+    thread = bool(dto.get("reply_to_id"))
+    if thread:
+        params.append(dto["reply_to_id"])
+
+    after = dto.get("after")
+    params.extend(after or (THREAD_START if thread else FEED_START))
+    # курсор и OFFSET не сочетаются: в режиме курсора смещение всегда 0
+    params.extend([0 if after else dto["offset"], dto["limit"]])
+
+    return FEED_QUERIES[(bool(search_query), bool(dto.get("owner_id")), thread)], params
+
+
+def detailed_post_row(cursor) -> Callable[[Sequence], dict]:
+    """row factory для psycopg: строка ленты/поста сразу в форме DetailedPostReadDTO.
+
+    Индексы колонок ищутся один раз на результат, на строку создаются только два dict ответа.
+    """
+    index = {column.name: i for i, column in enumerate(cursor.description or ())}
+    if not index:
+        return tuple
+    post_id = index["post_id"] if "post_id" in index else index["id"]
+    (text, reply_to_id, created_at, likes_count, views_count, replies_count,
+     user_liked, user_viewed, user_id, user_name, first_name, last_name) = (
+        index[name] for name in (
+            "text", "reply_to_id", "created_at", "likes_count", "views_count", "replies_count",
+            "user_liked", "user_viewed", "user_id", "user_name", "first_name", "last_name",
+        )
+    )
+
+    def make_row(values: Sequence) -> dict:
+        return {
+            "id": values[post_id],
+            "text": values[text],
+            "reply_to_id": values[reply_to_id],
+            "created_at": values[created_at],
+            "likes_count": values[likes_count],
+            "views_count": values[views_count],
+            "replies_count": values[replies_count],
+            "user_liked": values[user_liked],
+            "user_viewed": values[user_viewed],
+            "user": {
+                "id": values[user_id],
+                "user_name": values[user_name],
+                "first_name": values[first_name],
+                "last_name": values[last_name],
+            },
+        }
+
+    return make_row
+
+
+metrics.register_queries("post_queries", globals())
@@ -0,0 +1,102 @@
+from utils import metrics
+
+
+CREATE_USER = """
+    INSERT INTO users (user_name, first_name, last_name, password_hash)
+    VALUES (%s, %s, %s, %s)
+    RETURNING id, user_name, password_hash, status;
+"""
+
+# только поля ReadUserDTO: строки отдаются клиенту как есть;
+# порядок по id - страницы стабильны и идут по индексу users_active_id_idx
+GET_ALL_USERS = """
+    SELECT id, user_name, first_name, last_name, status
+    FROM users
+    WHERE deleted_at IS NULL
+    ORDER BY id
+    OFFSET %s LIMIT %s;
+"""
+
+GET_USERS_AFTER = """
+    SELECT id, user_name, first_name, last_name, status
+    FROM users
+    WHERE deleted_at IS NULL AND id > %s
+    ORDER BY id
+    LIMIT %s;
+"""
+
+# оценка по статистике планировщика вместо COUNT(*): строки таблицы * доля deleted_at IS NULL
+ESTIMATE_USERS_COUNT = """
+    SELECT (GREATEST(c.reltuples, 0) * COALESCE(s.null_frac, 1))::bigint
+    FROM pg_class c
+    LEFT JOIN pg_stats s
+        ON s.schemaname = current_schema() AND s.tablename = 'users' AND s.attname = 'deleted_at'
+    WHERE c.oid = 'users'::regclass;
+"""
+
+GET_USER_BY_ID = """
+    SELECT id, user_name, first_name, last_name, status
+    FROM users
+    WHERE id = %s;
+"""
+
+GET_USERS_BY_IDS = """
+    SELECT id, user_name, first_name, last_name, status
+    FROM users
+    WHERE id = ANY(%s);
+"""
+
+GET_USER_BY_USERNAME = """
+    SELECT id, user_name, password_hash, status
+    FROM users
+    WHERE user_name = %s AND deleted_at IS NULL;
+"""
+
+DELETE_USER = """
+    UPDATE users
+    SET deleted_at = NOW()
+    WHERE id = %s;
+"""
+
+
+def get_all_users_query(limit: int, offset: int, after_id: int | None = None) -> tuple[str, tuple]:
+    if after_id is None:
+        return GET_ALL_USERS, (offset, limit)
+    return GET_USERS_AFTER, (after_id, limit)
+
+
+def update_user_query(user_id: int, dto: dict) -> tuple[str, list]:
+    fields = []
+    values = []
+
+    if dto.get("password_hash"):
+        fields.append("password_hash = %s")
+        values.append(dto["password_hash"])
+    if dto.get("user_name"):
+        fields.append("user_name = %s")
+        values.append(dto["user_name"])
+    if dto.get("first_name"):
+        fields.append("first_name = %s")
+        values.append(dto["first_name"])
+    if dto.get("last_name"):
+        fields.append("last_name = %s")
+        values.append(dto["last_name"])
+
+    if not fields:
+        raise ValueError("No fields to update")
+
+    fields.append("updated_at = NOW()")
+    values.append(user_id)
+
+    query = f"""
+        UPDATE users
+        SET {", ".join(fields)}
+        WHERE id = %s AND deleted_at IS NULL
+        RETURNING id, user_name, first_name, last_name, status, created_at, updated_at;
+    """
+    # набор полей ограничен, так что текстов не больше нескольких десятков
+    metrics.name_query(query, "user_queries.update_user")
+    return query, values
+
+
+metrics.register_queries("user_queries", globals())
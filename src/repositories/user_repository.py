@@ -1,13 +1,10 @@
 from config.db import pool
 from psycopg.rows import dict_row
 
+from repositories import user_queries
+
 
 def create_user(dto: dict) -> dict:
-    query = """
-        INSERT INTO users (user_name, first_name, last_name, password_hash)
-        VALUES (%s, %s, %s, %s)
-        RETURNING id, user_name, password_hash, status;
-    """
     values = (
         dto["user_name"],
         dto["first_name"],
@@ -17,33 +14,30 @@ def create_user(dto: dict) -> dict:
 
     with pool.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(query, values)
+            cur.execute(user_queries.CREATE_USER, values)
             return cur.fetchone()
 
 
-def get_all_users(limit: int, offset: int) -> list[dict]:
-    query = """
-        SELECT id, user_name, first_name, last_name, status, created_at, updated_at
-        FROM users
-        WHERE deleted_at IS NULL
-        OFFSET %s LIMIT %s;
-    """
-    params = (offset, limit)
+def get_all_users(limit: int, offset: int, after_id: int | None = None) -> list[dict]:
+    query, params = user_queries.get_all_users_query(limit, offset, after_id)
 
     with pool.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
             cur.execute(query, params)
             return cur.fetchall()
 
+
+def estimate_users_count() -> int:
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(user_queries.ESTIMATE_USERS_COUNT)
+            row = cur.fetchone()
+            return row[0] if row else 0
+
 def get_user_by_id(user_id: int) -> dict:
-    query = """
-        SELECT id, user_name, first_name, last_name, status, created_at, updated_at
-        FROM users
-        WHERE id = %s;
-    """
     with pool.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(query, (user_id,))
+            cur.execute(user_queries.GET_USER_BY_ID, (user_id,))
             result = cur.fetchone()
 
             if result is None:
@@ -51,15 +45,19 @@ def get_user_by_id(user_id: int) -> dict:
 
             return result
 
+def get_users_by_ids(user_ids: list[int]) -> list[dict]:
+    with pool.connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(user_queries.GET_USERS_BY_IDS, (user_ids,))
+            by_id = {row["id"]: row for row in cur.fetchall()}
+
+    return [by_id[user_id] for user_id in dict.fromkeys(user_ids) if user_id in by_id]
+
+
 def get_user_by_username(user_name: str) -> dict:
-  query = """
-      SELECT id, user_name, password_hash, status
-      FROM users
-      WHERE user_name = %s;
-  """
   with pool.connection() as conn:
       with conn.cursor(row_factory=dict_row) as cur:
-          cur.execute(query, (user_name,))
+          cur.execute(user_queries.GET_USER_BY_USERNAME, (user_name,))
           result = cur.fetchone()
 
           if result is None:
@@ -67,34 +65,7 @@ def get_user_by_username(user_name: str) -> dict:
           return result
 
 def update_user(user_id: int, dto: dict) -> dict:
-    fields = []
-    values = []
-
-    if dto.get("password_hash"):
-        fields.append("password_hash = %s")
-        values.append(dto["password_hash"])
-    if dto.get("user_name"):
-        fields.append("user_name = %s")
-        values.append(dto["user_name"])
-    if dto.get("first_name"):
-        fields.append("first_name = %s")
-        values.append(dto["first_name"])
-    if dto.get("last_name"):
-        fields.append("last_name = %s")
-        values.append(dto["last_name"])
-
-    if not fields:
-        raise ValueError("No fields to update")
-
-    fields.append("updated_at = NOW()")
-    values.append(user_id)
-
-    query = f"""
-        UPDATE users
-        SET {", ".join(fields)}
-        WHERE id = %s AND deleted_at IS NULL
-        RETURNING id, user_name, first_name, last_name, status, created_at, updated_at;
-    """
+    query, values = user_queries.update_user_query(user_id, dto)
 
     with pool.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
@@ -107,14 +78,8 @@ def update_user(user_id: int, dto: dict) -> dict:
             return result
 
 def delete_user(user_id: int) -> None:
-    query = """
-        UPDATE users
-        SET deleted_at = NOW()
-        WHERE id = %s;
-    """
-
     with pool.connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(query, (user_id,))
+            cur.execute(user_queries.DELETE_USER, (user_id,))
             if cur.rowcount == 0:
                 raise ValueError("User not found")
@@ -0,0 +1,113 @@
+import argparse
+import statistics
+import time
+
+import psycopg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config.db import conninfo
+from repositories import post_queries
+
+
+# исходный запрос ленты: агрегаты по всем likes/views/posts, затем join и только потом OFFSET/LIMIT
+LEGACY_FEED_QUERY = """
+    WITH likes_count AS (
+        SELECT post_id, COUNT(*) AS likes_count
+        FROM likes GROUP BY post_id
+    ),
+    views_count AS (
+        SELECT post_id, COUNT(*) AS views_count
+        FROM views GROUP BY post_id
+    ),
+    replies_count AS (
+        SELECT reply_to_id, COUNT(*) AS replies_count
+        FROM posts WHERE reply_to_id IS NOT NULL GROUP BY reply_to_id
+    )
+    SELECT
+        p.id, p.text, p.reply_to_id, p.created_at,
+        u.id AS user_id, u.user_name, u.first_name, u.last_name,
+        COALESCE(lc.likes_count, 0) AS likes_count,
+        COALESCE(vc.views_count, 0) AS views_count,
+        COALESCE(rc.replies_count, 0) AS replies_count,
+        CASE WHEN l.user_id IS NOT NULL THEN true ELSE false END AS user_liked,
+        CASE WHEN v.user_id IS NOT NULL THEN true ELSE false END AS user_viewed
+    FROM posts p
+    JOIN users u ON p.user_id = u.id
+    LEFT JOIN likes_count lc ON p.id = lc.post_id
+    LEFT JOIN views_count vc ON p.id = vc.post_id
+    LEFT JOIN replies_count rc ON p.id = rc.reply_to_id
+    LEFT JOIN likes l ON l.post_id = p.id AND l.user_id = %s
+    LEFT JOIN views v ON v.post_id = p.id AND v.user_id = %s
+    WHERE p.deleted_at IS NULL AND p.reply_to_id IS NULL
+    ORDER BY p.created_at DESC
+    OFFSET %s LIMIT %s
+"""
+
+# один проход по счётчикам-колонкам, но join и флаги считаются до OFFSET/LIMIT
+SINGLE_PHASE_FEED_QUERY = """
+    SELECT
+        p.id, p.text, p.reply_to_id, p.created_at,
+        u.id AS user_id, u.user_name, u.first_name, u.last_name,
+        p.likes_count, p.views_count, p.replies_count,
+        CASE WHEN l.user_id IS NOT NULL THEN true ELSE false END AS user_liked,
+        CASE WHEN v.user_id IS NOT NULL THEN true ELSE false END AS user_viewed
+    FROM posts p
+    JOIN users u ON p.user_id = u.id
+    LEFT JOIN likes l ON l.post_id = p.id AND l.user_id = %s
+    LEFT JOIN views v ON v.post_id = p.id AND v.user_id = %s
+    WHERE p.deleted_at IS NULL AND p.reply_to_id IS NULL
+    ORDER BY p.created_at DESC, p.id DESC
+    OFFSET %s LIMIT %s
+"""
+
+
+def variants(user_id: int, offset: int, limit: int, legacy: bool) -> dict[str, tuple[str, list]]:
+    feed = {"user_id": user_id, "owner_id": 0, "limit": limit, "offset": offset, "reply_to_id": None, "search": ""}
+    result = {
+        "single-phase": (SINGLE_PHASE_FEED_QUERY, [user_id, user_id, offset, limit]),
+        "two-phase": post_queries.get_all_posts_query(feed),
+    }
+    if legacy:
+        result = {"legacy (aggregate CTEs)": (LEGACY_FEED_QUERY, [user_id, user_id, offset, limit]), **result}
+    return result
+
+
+def measure(conn: psycopg.Connection, query: str, params: list, repeat: int) -> list[float]:
+    conn.execute(query, params).fetchall()  # прогрев кэша и плана
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(query, params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare feed query shapes on a seeded database")
+    parser.add_argument("--pages", default="1,10,100,1000", help="comma separated page numbers")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--legacy", action="store_true",
+                        help="include the original aggregate-CTE query (slow on large tables)")
+    args = parser.parse_args()
+
+    with psycopg.connect(conninfo) as conn:
+        posts, user_id = conn.execute(
+            "SELECT (SELECT reltuples::bigint FROM pg_class WHERE relname = 'posts'), (SELECT MIN(id) FROM users)"
+        ).fetchone()
+        print(f"posts (estimated): {posts}, limit: {args.limit}, repeat: {args.repeat}")
+        print(f"{'page':>6}  {'query':<26} {'p50 ms':>9} {'p95 ms':>9}")
+
+        for page in map(int, args.pages.split(",")):
+            offset = (page - 1) * args.limit
+            for name, (query, params) in variants(user_id, offset, args.limit, args.legacy).items():
+                timings = sorted(measure(conn, query, params, args.repeat))
+                p50 = statistics.median(timings)
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(f"{page:>6}  {name:<26} {p50:>9.2f} {p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
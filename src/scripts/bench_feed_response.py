@@ -0,0 +1,60 @@
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from dto.post_dto import DetailedPostReadDTO
+from utils.responses import TrustedJSONResponse
+
+
+def feed_page(rows: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": 1_000_000 - i,
+            "text": f"post number {i}",
+            "reply_to_id": None,
+            "created_at": now - timedelta(seconds=i),
+            "likes_count": i * 7,
+            "views_count": i * 31,
+            "replies_count": i % 5,
+            "user_liked": i % 2 == 0,
+            "user_viewed": i % 3 == 0,
+            "user": {"id": i, "user_name": f"user_{i}", "first_name": "Имя", "last_name": None},
+        }
+        for i in range(rows)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare feed response rendering paths (no database needed)")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    posts = feed_page(args.rows)
+    adapter = TypeAdapter(List[DetailedPostReadDTO])
+
+    # что делает FastAPI для response_model: валидация, сериализация в json-совместимые типы, json.dumps
+    def validated() -> bytes:
+        return JSONResponse(adapter.dump_python(adapter.validate_python(posts), mode="json")).body
+
+    def trusted() -> bytes:
+        return TrustedJSONResponse(posts).body
+
+    assert json.loads(validated()) == json.loads(trusted())
+
+    print(f"rows: {args.rows}, iterations: {args.number}")
+    baseline = None
+    for name, fn in (("response_model + json", validated), ("trusted orjson", trusted)):
+        per_call = min(timeit.repeat(fn, number=args.number, repeat=3)) / args.number * 1_000_000
+        baseline = baseline or per_call
+        print(f"{name:<24} {per_call:>9.1f} us/response  x{baseline / per_call:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from repositories import post_queries
+
+
+COLUMNS = ["user_liked", "user_viewed", "id", "text", "reply_to_id", "created_at", "user_id",
+           "user_name", "first_name", "last_name", "likes_count", "views_count", "replies_count"]
+
+
+def feed_rows(rows: int) -> list[tuple]:
+    now = datetime.now(timezone.utc)
+    return [
+        (i % 2 == 0, i % 3 == 0, 1_000_000 - i, f"post number {i}", None, now - timedelta(seconds=i),
+         i, f"user_{i}", "first", None, i * 7, i * 31, i % 5)
+        for i in range(rows)
+    ]
+
+
+# прежний путь: dict_row на строку и второй, вложенный dict из него
+def to_detailed_post(row: dict) -> dict:
+    return {
+        "id": row["id"],
+        "text": row["text"],
+        "reply_to_id": row["reply_to_id"],
+        "created_at": row["created_at"],
+        "likes_count": row["likes_count"],
+        "views_count": row["views_count"],
+        "replies_count": row["replies_count"],
+        "user_liked": row["user_liked"],
+        "user_viewed": row["user_viewed"],
+        "user": {
+            "id": row["user_id"],
+            "user_name": row["user_name"],
+            "first_name": row["first_name"],
+            "last_name": row["last_name"],
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare row mapping for a feed page (no database needed)")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    cursor = SimpleNamespace(description=[SimpleNamespace(name=name) for name in COLUMNS])
+    rows = feed_rows(args.rows)
+
+    # как psycopg: фабрика вызывается один раз на результат, её функция - на каждую строку
+    def dict_row_reshape() -> list[dict]:
+        names = [column.name for column in cursor.description]  # то же, что делает psycopg.rows.dict_row
+        return [to_detailed_post(dict(zip(names, values))) for values in rows]
+
+    def compact_row() -> list[dict]:
+        make_row = post_queries.detailed_post_row(cursor)
+        return [make_row(values) for values in rows]
+
+    assert dict_row_reshape() == compact_row()
+
+    print(f"rows: {args.rows}, iterations: {args.number}")
+    for name, fn in (("dict_row + reshape", dict_row_reshape), ("detailed_post_row", compact_row)):
+        per_call = min(timeit.repeat(fn, number=args.number, repeat=3)) / args.number * 1000
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<20} {per_call:>8.3f} ms/page  peak {peak / 1024:>8.1f} KiB")
+
+    # промежуточный dict освобождается сразу после reshape, поэтому на пике памяти он не виден -
+    # это аллокации (и хеширование 13 имён колонок) на каждую строку, которых больше нет
+    transient = sys.getsizeof(dict(zip(COLUMNS, rows[0]))) * args.rows
+    print(f"transient dict_row dicts no longer allocated: {args.rows} x 13 keys, {transient / 1024:.1f} KiB per page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import sys
+
+import psycopg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config.db import conninfo
+from repositories import post_queries, user_queries
+
+
+def sample_ids(conn: psycopg.Connection) -> dict:
+    row = conn.execute("""
+        SELECT
+            (SELECT id FROM users WHERE deleted_at IS NULL ORDER BY id LIMIT 1),
+            (SELECT user_name FROM users WHERE deleted_at IS NULL ORDER BY id LIMIT 1),
+            (SELECT id FROM posts WHERE deleted_at IS NULL ORDER BY id LIMIT 1),
+            (SELECT created_at FROM posts WHERE deleted_at IS NULL ORDER BY id LIMIT 1),
+            (SELECT reply_to_id FROM posts WHERE reply_to_id IS NOT NULL LIMIT 1)
+    """).fetchone()
+    if row[0] is None or row[2] is None:
+        raise SystemExit("Database is empty, seed it before checking plans")
+    user_id, user_name, post_id, created_at, reply_to_id = row
+    return {
+        "user_id": user_id,
+        "user_name": user_name,
+        "post_id": post_id,
+        "created_at": created_at,
+        "reply_to_id": reply_to_id or post_id,
+    }
+
+
+def repository_queries(ids: dict) -> list[tuple[str, str, tuple | list]]:
+    feed = {"user_id": ids["user_id"], "owner_id": 0, "limit": 10, "offset": 0, "reply_to_id": None, "search": ""}
+    after = (ids["created_at"], ids["post_id"])
+
+    return [
+        ("post_repository.get_all_posts[feed]", *post_queries.get_all_posts_query(feed)),
+        ("post_repository.get_all_posts[feed, cursor]",
+         *post_queries.get_all_posts_query({**feed, "after": after})),
+        ("post_repository.get_all_posts[thread]",
+         *post_queries.get_all_posts_query({**feed, "reply_to_id": ids["reply_to_id"]})),
+        ("post_repository.get_all_posts[owner]",
+         *post_queries.get_all_posts_query({**feed, "owner_id": ids["user_id"]})),
+        ("post_repository.get_all_posts[search]",
+         *post_queries.get_all_posts_query({**feed, "search": "lorem"})),
+        ("post_repository.get_post_by_id", post_queries.GET_POST_BY_ID,
+         (ids["user_id"], ids["user_id"], ids["post_id"])),
+        ("post_repository.get_posts_by_ids", post_queries.GET_POSTS_BY_IDS,
+         (ids["user_id"], ids["user_id"], [ids["post_id"]])),
+        ("post_repository.get_user_post_flags", post_queries.GET_USER_POST_FLAGS,
+         (ids["user_id"], ids["user_id"], [ids["post_id"]])),
+        ("post_repository.delete_post", post_queries.DELETE_POST, (ids["post_id"], ids["user_id"])),
+        ("post_repository.view_post", post_queries.VIEW_POST, (ids["post_id"], ids["user_id"])),
+        ("post_repository.view_posts", post_queries.VIEW_POSTS, (ids["user_id"], [ids["post_id"]])),
+        ("post_repository.like_post", post_queries.LIKE_POST, (ids["post_id"], ids["user_id"])),
+        ("post_repository.dislike_post", post_queries.DISLIKE_POST, (ids["post_id"], ids["user_id"])),
+        ("user_repository.get_all_users", *user_queries.get_all_users_query(10, 0)),
+        ("user_repository.get_all_users[cursor]", *user_queries.get_all_users_query(10, 0, ids["user_id"])),
+        ("user_repository.get_user_by_id", user_queries.GET_USER_BY_ID, (ids["user_id"],)),
+        ("user_repository.get_users_by_ids", user_queries.GET_USERS_BY_IDS, ([ids["user_id"]],)),
+        ("user_repository.get_user_by_username", user_queries.GET_USER_BY_USERNAME, (ids["user_name"],)),
+    ]
+
+
+def seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def check(force_index: bool = True) -> list[str]:
+    failures = []
+
+    with psycopg.connect(conninfo) as conn:
+        ids = sample_ids(conn)
+        if force_index:
+            # на маленькой локальной базе seq scan дешевле любого индекса;
+            # с enable_seqscan=off он останется только там, где индекса нет вовсе
+            conn.execute("SET enable_seqscan = off")
+
+        for name, query, params in repository_queries(ids):
+            plan = conn.execute(f"EXPLAIN (FORMAT JSON) {query}", params).fetchone()[0][0]["Plan"]
+            scanned = set(seq_scans(plan))
+            status = "FAIL" if scanned else "ok"
+            print(f"{status:4} {name}" + (f"  seq scan on: {', '.join(sorted(scanned))}" if scanned else ""))
+            if scanned:
+                failures.append(name)
+
+        conn.rollback()
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if a repository query plans a sequential scan")
+    parser.add_argument("--no-force-index", action="store_true",
+                        help="keep enable_seqscan on (use on a realistically sized database)")
+    args = parser.parse_args()
+
+    sys.exit(1 if check(force_index=not args.no_force_index) else 0)
@@ -0,0 +1,297 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+
+DEFAULT_MIX = "feed=45,thread=15,search=10,like=8,view=12,login=7,register=3"
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name.strip()}")
+        mix[name.strip()] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("Mix must have a positive weight")
+    return mix
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank перцентиль по отсортированному списку."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples: dict[str, list[tuple[float, int]]], duration: float) -> dict:
+    """samples: сценарий -> [(latency_ms, status)], status 0 - ошибка соединения/таймаут."""
+    routes = {}
+    for name, values in sorted(samples.items()):
+        latencies = sorted(latency for latency, _ in values)
+        statuses = defaultdict(int)
+        for _, status in values:
+            statuses[str(status)] += 1
+        errors = sum(1 for _, status in values if not 200 <= status < 300)
+        routes[name] = {
+            "count": len(values),
+            "rps": len(values) / duration if duration else 0,
+            "error_rate": errors / len(values) if values else 0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1] if latencies else 0,
+            "statuses": dict(statuses),
+        }
+    total = sum(route["count"] for route in routes.values())
+    return {
+        "duration_s": duration,
+        "requests": total,
+        "rps": total / duration if duration else 0,
+        "error_rate": (sum(route["error_rate"] * route["count"] for route in routes.values()) / total) if total else 0,
+        "routes": routes,
+    }
+
+
+class Context:
+    """Данные для сценариев: токены засеянных пользователей, id постов и тредов."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.tokens: list[str] = []
+        self.post_ids: list[int] = []
+        self.thread_ids: list[int] = []
+        self.registered = 0
+        self.run_id = datetime.now().strftime("%H%M%S")
+
+    def auth(self) -> dict:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    def user_name(self) -> str:
+        return f"user{self.rng.randint(1, self.args.users)}"
+
+
+async def feed(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    offset = ctx.rng.choice((0, 0, 0, 10, 20, 50))
+    return await client.get("/api/posts/", params={"limit": 10, "offset": offset}, headers=ctx.auth())
+
+
+async def thread(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    reply_to_id = ctx.rng.choice(ctx.thread_ids or ctx.post_ids)
+    return await client.get("/api/posts/", params={"limit": 10, "reply_to_id": reply_to_id}, headers=ctx.auth())
+
+
+async def search(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    term = ctx.rng.choice(("lorem", "go", "postgres", "cache pool", "feed", "dolor sit"))
+    return await client.get("/api/posts/", params={"limit": 10, "search": term}, headers=ctx.auth())
+
+
+async def like(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    post_id = ctx.rng.choice(ctx.post_ids)
+    response = await client.post(f"/api/posts/{post_id}/like", headers=ctx.auth())
+    if response.status_code == 404:
+        # уже лайкнут - снимаем лайк, чтобы сценарий не копил ошибки
+        response = await client.delete(f"/api/posts/{post_id}/like", headers=ctx.auth())
+    return response
+
+
+async def view(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    # пакетный эндпоинт: повторный просмотр не считается ошибкой
+    post_ids = ctx.rng.sample(ctx.post_ids, min(3, len(ctx.post_ids)))
+    return await client.post("/api/posts/views", json={"post_ids": post_ids}, headers=ctx.auth())
+
+
+async def login(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.post("/api/auth/login",
+                             json={"user_name": ctx.user_name(), "password": ctx.args.password})
+
+
+async def register(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    ctx.registered += 1
+    return await client.post("/api/auth/register", json={
+        "user_name": f"lt{ctx.run_id}x{ctx.registered}",
+        "password": ctx.args.password,
+        "password_confirm": ctx.args.password,
+        "first_name": "Load",
+        "last_name": "Test",
+    })
+
+
+SCENARIOS = {
+    "feed": feed,
+    "thread": thread,
+    "search": search,
+    "like": like,
+    "view": view,
+    "login": login,
+    "register": register,
+}
+
+
+async def prepare(client: httpx.AsyncClient, ctx: Context) -> None:
+    for _ in range(ctx.args.tokens):
+        response = await client.post("/api/auth/login",
+                                     json={"user_name": ctx.user_name(), "password": ctx.args.password})
+        if response.status_code == 200:
+            ctx.tokens.append(response.json()["access_token"])
+    if not ctx.tokens:
+        sys.exit("Could not log in as any seeded user: run scripts.seed and check --password")
+
+    for offset in range(0, 200, 50):
+        response = await client.get("/api/posts/", params={"limit": 50, "offset": offset}, headers=ctx.auth())
+        for post in response.json():
+            ctx.post_ids.append(post["id"])
+            if post["replies_count"]:
+                ctx.thread_ids.append(post["id"])
+    if not ctx.post_ids:
+        sys.exit("The feed is empty: run scripts.seed first")
+
+
+async def timed(
+    client: httpx.AsyncClient, ctx: Context, name: str, samples: dict, scheduled_at: float | None = None
+) -> None:
+    # в открытой модели задержка считается от запланированного прихода запроса,
+    # иначе время ожидания свободного слота не попадает в перцентили
+    started = scheduled_at if scheduled_at is not None else time.perf_counter()
+    try:
+        status = (await SCENARIOS[name](client, ctx)).status_code
+    except httpx.HTTPError:
+        status = 0
+    samples[name].append(((time.perf_counter() - started) * 1000, status))
+
+
+async def run(client: httpx.AsyncClient, ctx: Context, mix: dict[str, float]) -> dict:
+    args = ctx.args
+    names, weights = list(mix), list(mix.values())
+    samples: dict[str, list] = defaultdict(list)
+    deadline = time.perf_counter() + args.duration
+    started = time.perf_counter()
+
+    if args.rate:
+        # открытая модель: запросы приходят с фиксированной частотой, независимо от ответов
+        limit = asyncio.Semaphore(args.concurrency)
+        tasks = set()
+
+        async def fire(name: str, scheduled_at: float) -> None:
+            async with limit:
+                await timed(client, ctx, name, samples, scheduled_at)
+
+        next_at = started
+        while next_at < deadline:
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            task = asyncio.create_task(fire(ctx.rng.choices(names, weights)[0], next_at))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            next_at += 1 / args.rate
+        await asyncio.gather(*tasks)
+    else:
+        # закрытая модель: N клиентов, каждый шлёт следующий запрос после ответа
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                await timed(client, ctx, ctx.rng.choices(names, weights)[0], samples)
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+    return summarize(samples, time.perf_counter() - started)
+
+
+def start_server(port: int) -> subprocess.Popen:
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"],
+        cwd=src,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/api/health-check")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    sys.exit("The app did not become healthy: is the database running and seeded?")
+
+
+def print_report(result: dict, baseline: dict | None = None) -> None:
+    print(f"{'route':<10} {'count':>7} {'rps':>8} {'err %':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+          + ("  p95 vs baseline" if baseline else ""))
+    for name, route in result["routes"].items():
+        line = (f"{name:<10} {route['count']:>7} {route['rps']:>8.1f} {route['error_rate'] * 100:>6.2f} "
+                f"{route['p50_ms']:>8.1f} {route['p95_ms']:>8.1f} {route['p99_ms']:>8.1f}")
+        previous = (baseline or {}).get("routes", {}).get(name)
+        if previous and previous["p95_ms"]:
+            line += f"  {(route['p95_ms'] / previous['p95_ms'] - 1) * 100:+.1f}%"
+        print(line)
+    print(f"total: {result['requests']} requests, {result['rps']:.1f} rps, "
+          f"error rate {result['error_rate'] * 100:.2f}%")
+
+
+async def main(args: argparse.Namespace) -> None:
+    mix = parse_mix(args.mix)
+    server = None if args.base_url else start_server(args.port)
+    base_url = args.base_url or f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            await wait_ready(client)
+            ctx = Context(args)
+            await prepare(client, ctx)
+            result = await run(client, ctx, mix)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    result = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("password", "output", "compare")},
+        **result,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"saved to {args.output}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test the API against a seeded database")
+    parser.add_argument("--base-url", help="test an already running app instead of starting one")
+    parser.add_argument("--port", type=int, default=3100, help="port for the app started by the harness")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights, default: {DEFAULT_MIX}")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=20,
+                        help="clients (closed model) or max requests in flight (with --rate)")
+    parser.add_argument("--rate", type=float, help="fixed arrival rate, requests per second (open model)")
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--users", type=int, default=1000, help="log in as user1..userN from scripts.seed")
+    parser.add_argument("--tokens", type=int, default=20, help="logged in users for authorized scenarios")
+    parser.add_argument("--password", default="Passw0rd!")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--compare", help="JSON from a previous run to compare p95 with")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
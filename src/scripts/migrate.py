@@ -0,0 +1,100 @@
+import argparse
+import re
+from pathlib import Path
+
+import psycopg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config.db import conninfo
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+CONCURRENT_INDEX = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE
+)
+
+
+def split_statements(sql: str) -> list[str]:
+    # CREATE INDEX CONCURRENTLY нельзя слать пачкой: каждая команда отдельно
+    statements = re.split(r";\s*(?:\n|$)", sql)
+    return [s.strip() for s in statements if s.strip() and not _is_comment_only(s)]
+
+
+def _is_comment_only(statement: str) -> bool:
+    return all(not line.strip() or line.strip().startswith("--") for line in statement.splitlines())
+
+
+def migration_number(version: str) -> int:
+    return int(version.split("_", 1)[0])
+
+
+def concurrent_index_name(statement: str) -> str | None:
+    match = CONCURRENT_INDEX.search(statement)
+    return match.group(1) if match else None
+
+
+def index_is_valid(conn: psycopg.Connection, name: str) -> bool | None:
+    """None - индекса нет; False - остался от упавшего CREATE INDEX CONCURRENTLY."""
+    row = conn.execute("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (name,)).fetchone()
+    return None if row is None else row[0]
+
+
+def pending_migrations(applied: set[str]) -> list[Path]:
+    return [path for path in sorted(MIGRATIONS_DIR.glob("*.sql")) if path.stem not in applied]
+
+
+def apply_migration(conn: psycopg.Connection, path: Path) -> None:
+    sql = path.read_text()
+
+    if NO_TRANSACTION_MARKER in sql:
+        indexes = []
+        for statement in split_statements(sql):
+            index = concurrent_index_name(statement)
+            # IF NOT EXISTS пропустил бы невалидный индекс от прерванной сборки - удаляем и строим заново
+            if index and index_is_valid(conn, index) is False:
+                conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+            conn.execute(statement)
+            if index:
+                indexes.append(index)
+        invalid = [index for index in indexes if not index_is_valid(conn, index)]
+        if invalid:
+            raise RuntimeError(f"{path.stem}: indexes are not valid after build: {', '.join(invalid)}")
+        conn.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (path.stem,))
+        return
+
+    with conn.transaction():
+        conn.execute(sql)
+        conn.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (path.stem,))
+
+
+def migrate(baseline: str | None = None) -> list[str]:
+    with psycopg.connect(conninfo, autocommit=True) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(255) PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT now()
+            )
+        """)
+        applied = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+
+        done = []
+        for path in pending_migrations(applied):
+            # --baseline: схема уже создана вручную (по старому README), только отмечаем версии
+            if baseline and migration_number(path.stem) <= migration_number(baseline):
+                conn.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (path.stem,))
+                continue
+            apply_migration(conn, path)
+            done.append(path.stem)
+        return done
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply pending SQL migrations from migrations/")
+    parser.add_argument("--baseline", help="mark migrations up to this version (e.g. 0001) as applied without running them")
+    args = parser.parse_args()
+
+    for version in migrate(args.baseline):
+        print(f"Applied {version}")
@@ -0,0 +1,12 @@
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config.db import pool
+from repositories.post_repository import reconcile_counters
+
+
+if __name__ == "__main__":
+    with pool:
+        fixed = reconcile_counters()
+    print(f"Reconciled counters for {fixed} posts")
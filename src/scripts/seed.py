@@ -0,0 +1,198 @@
+import argparse
+import math
+import random
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterator
+
+import bcrypt
+import psycopg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config.db import conninfo
+
+
+# соль фиксирована, чтобы одинаковый seed давал побайтно одинаковую базу
+SEED_SALT = b"$2b$10$gophertalkseedsaltsale"
+
+FIRST_NAMES = ["Иван", "Мария", "Алексей", "Ольга", "John", "Anna", "Peter", "Kate", "Дмитрий", "Elena"]
+LAST_NAMES = ["Иванов", "Смирнова", "Кузнецов", "Попова", "Smith", "Brown", "Miller", "Davis", None, None]
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore "
+    "magna aliqua go golang postgres fastapi python index query cache pool latency feed thread reply like view"
+).split()
+
+TABLES = ("likes", "views", "posts", "users")
+
+
+def zipf_rank(rng: random.Random, n: int, s: float) -> int:
+    """Ранг 1..n с вероятностью ~ 1/rank^s (обратная функция непрерывного приближения)."""
+    u = rng.random()
+    if abs(s - 1.0) < 1e-9:
+        rank = int(n ** u)
+    else:
+        rank = int(((n ** (1 - s) - 1) * u + 1) ** (1 / (1 - s)))
+    return min(max(rank, 1), n)
+
+
+def rank_to_id(rank: int, n: int, step: int, offset: int = 0) -> int:
+    """Биекция рангов 1..n на id 1..n: популярные посты разбросаны по всей ленте, а не только самые старые."""
+    return ((rank - 1) * step + offset) % n + 1
+
+
+def coprime_step(n: int, rng: random.Random) -> int:
+    step = rng.randrange(n // 3 + 1, n // 2 + 2) if n > 2 else 1
+    while math.gcd(step, n) != 1:
+        step += 1
+    return step
+
+
+def post_text(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))[:280]
+
+
+def build_posts(args: argparse.Namespace) -> tuple[array, array, array]:
+    """Авторы, родители и число ответов для всех постов; id поста = индекс + 1, старые посты - меньшие id."""
+    rng = random.Random(f"{args.seed}:posts")
+    authors = array("q", bytes(8 * args.posts))
+    parents = array("q", bytes(8 * args.posts))
+    replies = array("i", bytes(4 * args.posts))
+    depths = array("B", bytes(args.posts))
+
+    for i in range(args.posts):
+        # активность авторов тоже по Zipf: немногие пишут большую часть постов
+        authors[i] = rank_to_id(zipf_rank(rng, args.users, args.zipf), args.users, 1)
+        if i and args.max_depth and rng.random() < args.reply_ratio:
+            # отвечают в основном на недавние посты
+            parent = i - 1 - min(i - 1, int(rng.expovariate(1 / 1000)))
+            if depths[parent] < args.max_depth:
+                parents[i] = parent + 1
+                depths[i] = depths[parent] + 1
+                replies[parent] += 1
+    return authors, parents, replies
+
+
+def engagement(args: argparse.Namespace) -> Iterator[tuple[int, int, bool]]:
+    """(user_id, post_id, liked) без повторов пары; лайк бывает только у просмотренного поста."""
+    rng = random.Random(f"{args.seed}:engagement")
+    step = coprime_step(args.posts, rng)
+    offset = rng.randrange(args.posts)
+    mean_views = args.views / args.users
+    like_ratio = args.likes / args.views if args.views else 0
+    cap = args.posts // 2
+
+    for user_id in range(1, args.users + 1):
+        count = min(cap, int(rng.expovariate(1 / mean_views))) if mean_views else 0
+        seen = set()
+        attempts = count * 4
+        while len(seen) < count and attempts:
+            attempts -= 1
+            post_id = rank_to_id(zipf_rank(rng, args.posts, args.zipf), args.posts, step, offset)
+            if post_id not in seen:
+                seen.add(post_id)
+                yield user_id, post_id, rng.random() < like_ratio
+
+
+def created_at(start: datetime, span: timedelta, index: int, total: int) -> datetime:
+    return start + span * (index / total)
+
+
+def copy_users(cur: psycopg.Cursor, args: argparse.Namespace, start: datetime) -> None:
+    rng = random.Random(f"{args.seed}:users")
+    password_hash = bcrypt.hashpw(args.password.encode(), SEED_SALT).decode()
+    span = timedelta(days=args.days)
+    with cur.copy("COPY users (id, user_name, first_name, last_name, password_hash, status, created_at) "
+                  "FROM STDIN") as copy:
+        for i in range(args.users):
+            copy.write_row((i + 1, f"user{i + 1}", rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                            password_hash, 1, created_at(start, span / 2, i, args.users)))
+
+
+def copy_posts(cur: psycopg.Cursor, args: argparse.Namespace, start: datetime,
+               authors: array, parents: array, replies: array, likes: array, views: array) -> None:
+    rng = random.Random(f"{args.seed}:texts")
+    span = timedelta(days=args.days)
+    with cur.copy("COPY posts (id, text, reply_to_id, user_id, created_at, likes_count, views_count, replies_count) "
+                  "FROM STDIN") as copy:
+        for i in range(args.posts):
+            copy.write_row((i + 1, post_text(rng), parents[i] or None, authors[i],
+                            created_at(start + span / 2, span / 2, i, args.posts), likes[i], views[i], replies[i]))
+
+
+def copy_engagement(cur: psycopg.Cursor, args: argparse.Namespace) -> tuple[int, int]:
+    views_total = likes_total = 0
+    with cur.copy("COPY views (user_id, post_id) FROM STDIN") as copy:
+        for user_id, post_id, _ in engagement(args):
+            copy.write_row((user_id, post_id))
+            views_total += 1
+    with cur.copy("COPY likes (user_id, post_id) FROM STDIN") as copy:
+        for user_id, post_id, liked in engagement(args):
+            if liked:
+                copy.write_row((user_id, post_id))
+                likes_total += 1
+    return views_total, likes_total
+
+
+def seed(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+
+    def step(message: str) -> None:
+        print(f"[{time.perf_counter() - started:8.1f}s] {message}", flush=True)
+
+    start = datetime(2024, 1, 1)
+    authors, parents, replies = build_posts(args)
+    step(f"generated {args.posts} posts")
+
+    # первый проход считает счётчики, чтобы посты сразу легли с likes_count/views_count;
+    # второй (тот же seed - те же пары) пишет сами лайки и просмотры
+    likes = array("i", bytes(4 * args.posts))
+    views = array("i", bytes(4 * args.posts))
+    for _, post_id, liked in engagement(args):
+        views[post_id - 1] += 1
+        likes[post_id - 1] += liked
+    step(f"counted {sum(views)} views and {sum(likes)} likes")
+
+    with psycopg.connect(conninfo) as conn:
+        with conn.cursor() as cur:
+            if args.truncate:
+                cur.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY")
+            copy_users(cur, args, start)
+            step(f"copied {args.users} users")
+            copy_posts(cur, args, start, authors, parents, replies, likes, views)
+            step(f"copied {args.posts} posts")
+            views_total, likes_total = copy_engagement(cur, args)
+            step(f"copied {views_total} views and {likes_total} likes")
+            cur.execute("SELECT setval('users_id_seq', (SELECT MAX(id) FROM users))")
+            cur.execute("SELECT setval('posts_id_seq', (SELECT MAX(id) FROM posts))")
+        conn.commit()
+        conn.autocommit = True
+        conn.execute("ANALYZE users, posts, likes, views")
+    step("analyzed, done")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-load a deterministic synthetic dataset with COPY")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--views", type=int, default=10_000_000, help="approximate total")
+    parser.add_argument("--likes", type=int, default=2_000_000, help="approximate total, at most --views")
+    parser.add_argument("--reply-ratio", type=float, default=0.4, help="share of posts that are replies")
+    parser.add_argument("--max-depth", type=int, default=5, help="maximum reply tree depth, 0 - no replies")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for post popularity and authors")
+    parser.add_argument("--days", type=int, default=365, help="time span of created_at")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--password", default="Passw0rd!", help="password of every generated user")
+    parser.add_argument("--truncate", action="store_true", help="empty the tables first")
+    args = parser.parse_args(argv)
+    if args.users < 1 or args.posts < 1:
+        parser.error("--users and --posts must be positive")
+    if args.likes > args.views:
+        parser.error("--likes must not exceed --views: a like is generated only for a viewed post")
+    return args
+
+
+if __name__ == "__main__":
+    seed(parse_args())
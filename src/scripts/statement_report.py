@@ -0,0 +1,73 @@
+import argparse
+import sys
+
+import psycopg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config.db import conninfo
+
+
+# plan-время заполняется только при pg_stat_statements.track_planning = on (PostgreSQL 13+)
+STATEMENTS_QUERY = """
+    SELECT
+        queryid,
+        calls,
+        plans,
+        total_plan_time,
+        total_exec_time,
+        rows,
+        query
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+      AND query NOT ILIKE '%%pg_stat_statements%%'
+    ORDER BY total_plan_time + total_exec_time DESC
+    LIMIT %s
+"""
+
+
+def summarize(row: tuple) -> dict:
+    queryid, calls, plans, plan_ms, exec_ms, rows, query = row
+    return {
+        "queryid": queryid,
+        "calls": calls,
+        # у подготовленного запроса план строится один раз на соединение, а не на каждый вызов
+        "plans_per_call": plans / calls if calls else 0,
+        "mean_plan_ms": plan_ms / plans if plans else 0,
+        "mean_exec_ms": exec_ms / calls if calls else 0,
+        "total_ms": plan_ms + exec_ms,
+        "rows_per_call": rows / calls if calls else 0,
+        "query": " ".join(query.split()),
+    }
+
+
+def report(conn: psycopg.Connection, top: int) -> list[dict]:
+    return [summarize(row) for row in conn.execute(STATEMENTS_QUERY, (top,)).fetchall()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-statement plan/execute time from pg_stat_statements")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--width", type=int, default=70, help="query text width")
+    parser.add_argument("--reset", action="store_true", help="reset pg_stat_statements after printing")
+    args = parser.parse_args()
+
+    with psycopg.connect(conninfo) as conn:
+        try:
+            statements = report(conn, args.top)
+        except psycopg.errors.UndefinedTable:
+            sys.exit("pg_stat_statements is not installed: add it to shared_preload_libraries "
+                     "and run CREATE EXTENSION pg_stat_statements")
+
+        print(f"{'calls':>9} {'plans/call':>10} {'plan ms':>9} {'exec ms':>9} {'total ms':>11} {'rows':>7}  query")
+        for s in statements:
+            print(f"{s['calls']:>9} {s['plans_per_call']:>10.3f} {s['mean_plan_ms']:>9.3f} {s['mean_exec_ms']:>9.3f} "
+                  f"{s['total_ms']:>11.1f} {s['rows_per_call']:>7.1f}  {s['query'][:args.width]}")
+
+        if args.reset:
+            conn.execute("SELECT pg_stat_statements_reset()")
+
+
+if __name__ == "__main__":
+    main()
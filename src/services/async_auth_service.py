@@ -0,0 +1,37 @@
+from psycopg.errors import UniqueViolation
+
+from repositories.async_user_repository import create_user, get_user_by_username
+from services import user_cache
+from services.auth_service import generate_token_pair
+from utils.hashing import check_password_async, hash_password_async
+
+
+async def login(dto: dict) -> dict:
+    user = await get_user_by_username(dto["user_name"])
+    if not user:
+        raise ValueError("User not found")
+
+    if not await check_password_async(dto["password"], user["password_hash"]):
+        raise ValueError("Wrong password")
+
+    return generate_token_pair(user["id"])
+
+
+async def register(dto: dict) -> dict:
+    password_hash = await hash_password_async(dto["password"])
+
+    user_data = {
+        "user_name": dto["user_name"],
+        "password_hash": password_hash,
+        "first_name": dto["first_name"],
+        "last_name": dto["last_name"],
+    }
+
+    try:
+        user = await create_user(user_data)
+    except UniqueViolation:
+        raise ValueError("User already exists")
+    # id мог быть запрошен до регистрации и закэширован как NOT_FOUND
+    user_cache.invalidate(user["id"])
+    return generate_token_pair(user["id"])
+
@@ -0,0 +1,77 @@
+import asyncio
+
+from repositories import async_post_repository
+from services import feed_cache
+from services.view_buffer import VIEW_BUFFER_ENABLED, view_buffer
+from utils import stats
+from utils.pagination import decode_cursor
+from utils.singleflight import AsyncSingleFlight
+
+
+# одинаковые одновременные запросы ленты выполняют один запрос к БД
+feed_reads = AsyncSingleFlight()
+stats.register("feed_reads", feed_reads.stats)
+
+
+async def get_all_posts(filter_dto: dict) -> list[dict]:
+    if filter_dto.get("cursor"):
+        filter_dto = {**filter_dto, "after": decode_cursor(filter_dto["cursor"])}
+
+    key = feed_cache.cache_key(filter_dto)
+    page = feed_cache.feed_cache.get(key, None)
+    if page is None:
+        posts, shared = await feed_reads.do(key, lambda: _load_feed_page(key, filter_dto))
+        if not shared:
+            return posts
+        # флаги в чужом результате относятся к другому пользователю
+        page = feed_cache.shared_page(posts)
+
+    if not page:
+        return []
+    flags = await async_post_repository.get_user_post_flags([post["id"] for post in page], filter_dto["user_id"])
+    return feed_cache.overlay_user_flags(page, flags)
+
+
+async def _load_feed_page(key: tuple, filter_dto: dict) -> list[dict]:
+    generation = feed_cache.generation()
+    posts = await async_post_repository.get_all_posts(filter_dto)
+    feed_cache.store(key, posts, generation)
+    return posts
+
+
+async def create_post(create_dto: dict) -> dict:
+    post = await async_post_repository.create_post(create_dto)
+    feed_cache.invalidate()
+    return post
+
+
+async def delete_post(post_id: int, owner_id: int) -> None:
+    await async_post_repository.delete_post(post_id, owner_id)
+    feed_cache.invalidate()
+
+
+async def view_post(post_id: int, user_id: int) -> None:
+    if VIEW_BUFFER_ENABLED:
+        if not view_buffer.offer(post_id, user_id):
+            # буфер полон: сбрасываем его в потоке, чтобы не блокировать event loop
+            await asyncio.to_thread(view_buffer.add, post_id, user_id)
+        return None
+    return await async_post_repository.view_post(post_id, user_id)
+
+
+async def get_posts_by_ids(post_ids: list[int], user_id: int) -> dict:
+    posts = await async_post_repository.get_posts_by_ids(post_ids, user_id)
+    found = {post["id"] for post in posts}
+    return {"posts": posts, "missing": [post_id for post_id in dict.fromkeys(post_ids) if post_id not in found]}
+
+
+async def view_posts(post_ids: list[int], user_id: int) -> list[int]:
+    return await async_post_repository.view_posts(post_ids, user_id)
+
+
+async def like_post(post_id: int, user_id: int) -> None:
+    return await async_post_repository.like_post(post_id, user_id)
+
+
+async def dislike_post(post_id: int, user_id: int) -> None:
+    return await async_post_repository.dislike_post(post_id, user_id)
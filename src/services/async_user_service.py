@@ -0,0 +1,85 @@
+from repositories import async_user_repository
+from services import user_cache
+from utils import stats
+from utils.hashing import hash_password_async
+from utils.pagination import decode_id_cursor
+from utils.singleflight import AsyncSingleFlight
+
+
+user_reads = AsyncSingleFlight()
+stats.register("user_reads", user_reads.stats)
+
+
+async def get_all_users(limit: int, offset: int, cursor: str | None = None) -> list[dict]:
+    after_id = decode_id_cursor(cursor) if cursor else None
+    users, _ = await user_reads.do(
+        ("all", limit, offset, after_id), lambda: async_user_repository.get_all_users(limit, offset, after_id)
+    )
+    return users
+
+
+async def estimate_users_count() -> int:
+    return await async_user_repository.estimate_users_count()
+
+
+async def get_user_by_id(user_id: int) -> dict:
+    user = user_cache.get(user_id)
+    if user is user_cache.MISSING:
+        user, _ = await user_reads.do(("id", user_id), lambda: _load_user(user_id))
+    if user is user_cache.NOT_FOUND:
+        raise ValueError("User not found")
+    return user
+
+
+async def _load_user(user_id: int):
+    generation = user_cache.generation()
+    try:
+        user = await async_user_repository.get_user_by_id(user_id)
+    except ValueError:
+        user = user_cache.NOT_FOUND
+    user_cache.store(user_id, user, generation)
+    return user
+
+
+async def get_users_by_ids(user_ids: list[int]) -> dict:
+    user_ids = list(dict.fromkeys(user_ids))
+    found = {}
+    to_load = []
+    for user_id in user_ids:
+        user = user_cache.get(user_id)
+        if user is user_cache.MISSING:
+            to_load.append(user_id)
+        elif user is not user_cache.NOT_FOUND:
+            found[user_id] = user
+
+    if to_load:
+        generation = user_cache.generation()
+        for user in await async_user_repository.get_users_by_ids(to_load):
+            found[user["id"]] = user
+        for user_id in to_load:
+            user_cache.store(user_id, found.get(user_id, user_cache.NOT_FOUND), generation)
+
+    return {
+        "users": [found[user_id] for user_id in user_ids if user_id in found],
+        "missing": [user_id for user_id in user_ids if user_id not in found],
+    }
+
+
+async def update_user(user_id: int, dto: dict) -> dict:
+    update_fields = dict(dto)
+
+    if update_fields.get("password"):
+        update_fields["password_hash"] = await hash_password_async(update_fields["password"])
+        del update_fields["password"]
+
+    try:
+        return await async_user_repository.update_user(user_id, update_fields)
+    finally:
+        user_cache.invalidate(user_id)
+
+
+async def delete_user(user_id: int) -> None:
+    try:
+        return await async_user_repository.delete_user(user_id)
+    finally:
+        user_cache.invalidate(user_id)
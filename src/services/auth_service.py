@@ -1,12 +1,14 @@
 from datetime import datetime, timedelta, UTC
 import os
 
-import bcrypt
 from fastapi import HTTPException
 from jose import jwt, JWTError
 from psycopg.errors import UniqueViolation
 
 from repositories.user_repository import create_user, get_user_by_username
+from services import user_cache
+from utils import metrics
+from utils.hashing import check_password, hash_password
 
 
 REFRESH_TOKEN_SECRET = os.getenv('REFRESH_TOKEN_SECRET')
@@ -24,14 +26,14 @@ def login(dto: dict) -> dict:
     if not user:
         raise ValueError("User not found")
 
-    if not bcrypt.checkpw(dto["password"].encode(), user["password_hash"].encode()):
+    if not check_password(dto["password"], user["password_hash"]):
         raise ValueError("Wrong password")
 
     return generate_token_pair(user["id"])
 
 
 def register(dto: dict) -> dict:
-    password_hash = bcrypt.hashpw(dto["password"].encode(), bcrypt.gensalt()).decode()
+    password_hash = hash_password(dto["password"])
 
     user_data = {
         "user_name": dto["user_name"],
@@ -44,23 +46,26 @@ def register(dto: dict) -> dict:
         user = create_user(user_data)
     except UniqueViolation:
         raise ValueError("User already exists")
+    # id мог быть запрошен до регистрации и закэширован как NOT_FOUND
+    user_cache.invalidate(user["id"])
     return generate_token_pair(user["id"])
 
 
 def generate_token_pair(user_id: int) -> dict:
     now = datetime.now(UTC)
 
-    access_token = jwt.encode(
-        {"sub": str(user_id), "exp": now + timedelta(seconds=ACCESS_EXPIRES)},
-        ACCESS_SECRET,
-        algorithm=ALGORITHM
-    )
+    with metrics.auth_jwt.time("encode"):
+        access_token = jwt.encode(
+            {"sub": str(user_id), "exp": now + timedelta(seconds=ACCESS_EXPIRES)},
+            ACCESS_SECRET,
+            algorithm=ALGORITHM
+        )
 
-    refresh_token = jwt.encode(
-        {"sub": str(user_id), "exp": now + timedelta(seconds=REFRESH_EXPIRES)},
-        REFRESH_SECRET,
-        algorithm=ALGORITHM
-    )
+        refresh_token = jwt.encode(
+            {"sub": str(user_id), "exp": now + timedelta(seconds=REFRESH_EXPIRES)},
+            REFRESH_SECRET,
+            algorithm=ALGORITHM
+        )
 
     return {
         "access_token": access_token,
@@ -70,7 +75,8 @@ def generate_token_pair(user_id: int) -> dict:
 
 def refresh(token: str) -> dict:
     try:
-        payload = jwt.decode(token, REFRESH_TOKEN_SECRET, algorithms=[ALGORITHM])
+        with metrics.auth_jwt.time("decode"):
+            payload = jwt.decode(token, REFRESH_TOKEN_SECRET, algorithms=[ALGORITHM])
         return generate_token_pair(payload["sub"])
     except JWTError as e:
         raise HTTPException(status_code=401, detail=str(e))
@@ -0,0 +1,57 @@
+import os
+import threading
+
+from utils import stats
+from utils.cache import TTLCache
+
+
+FEED_CACHE_SIZE = int(os.getenv("FEED_CACHE_SIZE", "1000"))  # 0 - кэш выключен
+FEED_CACHE_TTL = float(os.getenv("FEED_CACHE_TTL", "5"))     # сколько могут отставать счётчики, сек
+
+# общие для всех пользователей страницы ленты: посты, авторы, счётчики - без user_liked/user_viewed
+feed_cache = TTLCache(max_size=FEED_CACHE_SIZE, ttl=FEED_CACHE_TTL)
+stats.register("feed_cache", feed_cache.stats)
+
+_lock = threading.Lock()
+# растёт при каждой записи: страница, прочитанная до неё, в кэш не попадает
+_generation = 0
+
+
+def cache_key(filter_dto: dict) -> tuple:
+    position = ("cursor", filter_dto["cursor"]) if filter_dto.get("cursor") else ("offset", filter_dto.get("offset"))
+    return (
+        filter_dto.get("search") or "",
+        filter_dto.get("owner_id") or 0,
+        filter_dto.get("reply_to_id"),
+        filter_dto.get("limit"),
+        *position,
+    )
+
+
+def shared_page(posts: list[dict]) -> list[dict]:
+    return [{key: value for key, value in post.items() if key not in ("user_liked", "user_viewed")} for post in posts]
+
+
+def overlay_user_flags(page: list[dict], flags: dict[int, tuple[bool, bool]]) -> list[dict]:
+    return [
+        {**post, "user_liked": flags.get(post["id"], (False, False))[0],
+         "user_viewed": flags.get(post["id"], (False, False))[1]}
+        for post in page
+    ]
+
+
+def generation() -> int:
+    return _generation
+
+
+def store(key: tuple, posts: list[dict], read_generation: int) -> None:
+    with _lock:
+        if read_generation == _generation:
+            feed_cache.set(key, shared_page(posts))
+
+
+def invalidate() -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        feed_cache.clear()
@@ -1,22 +1,70 @@
 from repositories import post_repository
+from services import feed_cache
+from services.view_buffer import VIEW_BUFFER_ENABLED, view_buffer
+from utils import stats
+from utils.pagination import decode_cursor
+from utils.singleflight import SingleFlight
+
+
+# одинаковые одновременные запросы ленты выполняют один запрос к БД
+feed_reads = SingleFlight()
+stats.register("feed_reads", feed_reads.stats)
 
 
 def get_all_posts(filter_dto: dict) -> list[dict]:
-    return post_repository.get_all_posts(filter_dto)
+    if filter_dto.get("cursor"):
+        filter_dto = {**filter_dto, "after": decode_cursor(filter_dto["cursor"])}
+
+    key = feed_cache.cache_key(filter_dto)
+    page = feed_cache.feed_cache.get(key, None)
+    if page is None:
+        posts, shared = feed_reads.do(key, lambda: _load_feed_page(key, filter_dto))
+        if not shared:
+            return posts
+        # флаги в чужом результате относятся к другому пользователю
+        page = feed_cache.shared_page(posts)
+
+    if not page:
+        return []
+    flags = post_repository.get_user_post_flags([post["id"] for post in page], filter_dto["user_id"])
+    return feed_cache.overlay_user_flags(page, flags)
+
+
+def _load_feed_page(key: tuple, filter_dto: dict) -> list[dict]:
+    generation = feed_cache.generation()
+    posts = post_repository.get_all_posts(filter_dto)
+    feed_cache.store(key, posts, generation)
+    return posts
 
 
 def create_post(create_dto: dict) -> dict:
-    return post_repository.create_post(create_dto)
+    post = post_repository.create_post(create_dto)
+    feed_cache.invalidate()
+    return post
 
 
 def delete_post(post_id: int, owner_id: int) -> None:
-    return post_repository.delete_post(post_id, owner_id)
+    post_repository.delete_post(post_id, owner_id)
+    feed_cache.invalidate()
 
 
 def view_post(post_id: int, user_id: int) -> None:
+    if VIEW_BUFFER_ENABLED:
+        view_buffer.add(post_id, user_id)
+        return None
     return post_repository.view_post(post_id, user_id)
 
 
+def get_posts_by_ids(post_ids: list[int], user_id: int) -> dict:
+    posts = post_repository.get_posts_by_ids(post_ids, user_id)
+    found = {post["id"] for post in posts}
+    return {"posts": posts, "missing": [post_id for post_id in dict.fromkeys(post_ids) if post_id not in found]}
+
+
+def view_posts(post_ids: list[int], user_id: int) -> list[int]:
+    return post_repository.view_posts(post_ids, user_id)
+
+
 def like_post(post_id: int, user_id: int) -> None:
     return post_repository.like_post(post_id, user_id)
 
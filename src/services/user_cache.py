@@ -0,0 +1,59 @@
+import os
+import threading
+
+from utils import stats
+from utils.cache import MISSING, TTLCache
+
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))              # 0 - кэш выключен
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_NEGATIVE_TTL = float(os.getenv("USER_CACHE_NEGATIVE_TTL", "5"))  # для несуществующих id
+
+NOT_FOUND = object()
+
+user_cache = TTLCache(max_size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+_lock = threading.Lock()
+# растёт при каждой записи: чтение, начатое до неё, не кладёт в кэш устаревшую версию
+_generation = 0
+_negative_hits = 0
+
+
+def get(user_id: int):
+    """Профиль, NOT_FOUND для несуществующего id или MISSING, если в кэше ничего нет."""
+    global _negative_hits
+    user = user_cache.get(user_id)
+    if user is NOT_FOUND:
+        with _lock:
+            _negative_hits += 1
+    return user
+
+
+def generation() -> int:
+    return _generation
+
+
+def store(user_id: int, user, read_generation: int) -> None:
+    with _lock:
+        if read_generation != _generation:
+            return
+        if user is NOT_FOUND:
+            user_cache.set(user_id, NOT_FOUND, ttl=USER_CACHE_NEGATIVE_TTL)
+        else:
+            user_cache.set(user_id, user)
+
+
+def invalidate(user_id: int) -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        user_cache.delete(user_id)
+
+
+def user_cache_stats() -> dict:
+    with _lock:
+        negative_hits = _negative_hits
+    return {**user_cache.stats(), "negative_hits": negative_hits}
+
+
+stats.register("user_cache", user_cache_stats)
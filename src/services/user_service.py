@@ -1,27 +1,85 @@
-import bcrypt
-
 from repositories import user_repository
+from services import user_cache
+from utils import stats
+from utils.hashing import hash_password
+from utils.pagination import decode_id_cursor
+from utils.singleflight import SingleFlight
+
+
+user_reads = SingleFlight()
+stats.register("user_reads", user_reads.stats)
 
 
-def get_all_users(limit: int, offset: int) -> list[dict]:
-    return user_repository.get_all_users(limit, offset)
+def get_all_users(limit: int, offset: int, cursor: str | None = None) -> list[dict]:
+    after_id = decode_id_cursor(cursor) if cursor else None
+    users, _ = user_reads.do(
+        ("all", limit, offset, after_id), lambda: user_repository.get_all_users(limit, offset, after_id)
+    )
+    return users
+
+
+def estimate_users_count() -> int:
+    return user_repository.estimate_users_count()
 
 
 def get_user_by_id(user_id: int) -> dict:
-    return user_repository.get_user_by_id(user_id)
+    user = user_cache.get(user_id)
+    if user is user_cache.MISSING:
+        user, _ = user_reads.do(("id", user_id), lambda: _load_user(user_id))
+    if user is user_cache.NOT_FOUND:
+        raise ValueError("User not found")
+    return user
+
+
+def _load_user(user_id: int):
+    generation = user_cache.generation()
+    try:
+        user = user_repository.get_user_by_id(user_id)
+    except ValueError:
+        user = user_cache.NOT_FOUND
+    user_cache.store(user_id, user, generation)
+    return user
+
+
+def get_users_by_ids(user_ids: list[int]) -> dict:
+    user_ids = list(dict.fromkeys(user_ids))
+    found = {}
+    to_load = []
+    for user_id in user_ids:
+        user = user_cache.get(user_id)
+        if user is user_cache.MISSING:
+            to_load.append(user_id)
+        elif user is not user_cache.NOT_FOUND:
+            found[user_id] = user
+
+    if to_load:
+        generation = user_cache.generation()
+        for user in user_repository.get_users_by_ids(to_load):
+            found[user["id"]] = user
+        for user_id in to_load:
+            user_cache.store(user_id, found.get(user_id, user_cache.NOT_FOUND), generation)
+
+    return {
+        "users": [found[user_id] for user_id in user_ids if user_id in found],
+        "missing": [user_id for user_id in user_ids if user_id not in found],
+    }
 
 
 def update_user(user_id: int, dto: dict) -> dict:
     update_fields = dict(dto)
 
     if update_fields.get("password"):
-        update_fields["password_hash"] = bcrypt.hashpw(
-            update_fields["password"].encode(), bcrypt.gensalt()
-        ).decode()
+        update_fields["password_hash"] = hash_password(update_fields["password"])
         del update_fields["password"]
 
-    return user_repository.update_user(user_id, update_fields)
+    try:
+        return user_repository.update_user(user_id, update_fields)
+    finally:
+        user_cache.invalidate(user_id)
 
 
 def delete_user(user_id: int) -> None:
-    return user_repository.delete_user(user_id)
+    try:
+        return user_repository.delete_user(user_id)
+    finally:
+        user_cache.invalidate(user_id)
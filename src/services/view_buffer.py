@@ -0,0 +1,142 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+from repositories import post_repository
+from utils import stats
+
+
+VIEW_BUFFER_ENABLED = os.getenv("VIEW_BUFFER_ENABLED", "false").lower() == "true"
+VIEW_BUFFER_MAX_SIZE = int(os.getenv("VIEW_BUFFER_MAX_SIZE", "10000"))        # потолок памяти
+VIEW_BUFFER_FLUSH_SIZE = int(os.getenv("VIEW_BUFFER_FLUSH_SIZE", "1000"))     # сброс по размеру
+VIEW_BUFFER_FLUSH_INTERVAL = float(os.getenv("VIEW_BUFFER_FLUSH_INTERVAL", "1"))  # сброс по времени, сек
+
+logger = logging.getLogger(__name__)
+
+
+class ViewBuffer:
+    def __init__(self, flush_fn: Callable[[list[tuple[int, int]]], int], max_size: int, flush_size: int,
+                 flush_interval: float):
+        self.flush_fn = flush_fn
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._pending: dict[tuple[int, int], None] = {}  # (user_id, post_id), порядок вставки сохраняется
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._metrics = {
+            "added": 0,
+            "deduplicated": 0,
+            "rejected_full": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "flushed_views": 0,
+            "inserted_views": 0,
+            "dropped_views": 0,
+            "last_flush_size": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+        }
+
+    def offer(self, post_id: int, user_id: int) -> bool:
+        key = (user_id, post_id)
+        with self._lock:
+            if key in self._pending:
+                self._metrics["deduplicated"] += 1
+                return True
+            if len(self._pending) >= self.max_size:
+                self._metrics["rejected_full"] += 1
+                return False
+            self._pending[key] = None
+            self._metrics["added"] += 1
+            size = len(self._pending)
+
+        if size >= self.flush_size:
+            self._wakeup.set()
+        return True
+
+    def add(self, post_id: int, user_id: int) -> None:
+        # буфер полон - вызывающий поток сам сбрасывает его, это и есть backpressure
+        if self.offer(post_id, user_id):
+            return
+        self.flush()
+        if not self.offer(post_id, user_id):
+            # сброс не удался (база недоступна), буфер по-прежнему полон
+            with self._lock:
+                self._metrics["dropped_views"] += 1
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending = {}
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                inserted = self.flush_fn(batch)
+            except Exception:
+                logger.exception("Failed to flush %d buffered views", len(batch))
+                self._requeue(batch)
+                return 0
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            with self._lock:
+                self._metrics["flushes"] += 1
+                self._metrics["flushed_views"] += len(batch)
+                self._metrics["inserted_views"] += inserted
+                self._metrics["last_flush_size"] = len(batch)
+                self._metrics["last_flush_ms"] = elapsed_ms
+                self._metrics["max_flush_ms"] = max(self._metrics["max_flush_ms"], elapsed_ms)
+            return inserted
+
+    def _requeue(self, batch: list[tuple[int, int]]) -> None:
+        with self._lock:
+            self._metrics["flush_errors"] += 1
+            room = self.max_size - len(self._pending)
+            for key in batch[:room]:
+                self._pending.setdefault(key, None)
+            self._metrics["dropped_views"] += max(len(batch) - room, 0)
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="view-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            result = dict(self._metrics)
+            result["pending"] = len(self._pending)
+        result["max_size"] = self.max_size
+        return result
+
+
+view_buffer = ViewBuffer(
+    flush_fn=post_repository.record_views,
+    max_size=VIEW_BUFFER_MAX_SIZE,
+    flush_size=VIEW_BUFFER_FLUSH_SIZE,
+    flush_interval=VIEW_BUFFER_FLUSH_INTERVAL,
+)
+
+if VIEW_BUFFER_ENABLED:
+    stats.register("view_buffer", view_buffer.stats)
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import bcrypt
+
+from utils import metrics, stats
+
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", "16"))  # задачи сверх HASH_WORKERS, дальше - 503
+
+
+class HashingOverloadedError(Exception):
+    pass
+
+
+# bcrypt отпускает GIL, так что потоков достаточно, процессы не нужны
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE_SIZE)
+_lock = threading.Lock()
+_counters = {"submitted": 0, "rejected": 0, "in_flight": 0}
+
+
+def _release(_: Future) -> None:
+    with _lock:
+        _counters["in_flight"] -= 1
+    _slots.release()
+
+
+def _submit(fn, *args) -> Future:
+    if not _slots.acquire(blocking=False):
+        with _lock:
+            _counters["rejected"] += 1
+        raise HashingOverloadedError("Too many authentication requests, try again later")
+
+    with _lock:
+        _counters["submitted"] += 1
+        _counters["in_flight"] += 1
+    try:
+        future = _executor.submit(fn, *args)
+    except Exception:
+        _release(None)
+        raise
+    future.add_done_callback(_release)
+    return future
+
+
+def _hash(password: str) -> str:
+    with metrics.auth_bcrypt.time("hash"):
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
+
+
+def _check(password: str, password_hash: str) -> bool:
+    with metrics.auth_bcrypt.time("check"):
+        return bcrypt.checkpw(password.encode(), password_hash.encode())
+
+
+def hash_password(password: str) -> str:
+    return _submit(_hash, password).result()
+
+
+def check_password(password: str, password_hash: str) -> bool:
+    return _submit(_check, password, password_hash).result()
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit(_hash, password))
+
+
+async def check_password_async(password: str, password_hash: str) -> bool:
+    return await asyncio.wrap_future(_submit(_check, password, password_hash))
+
+
+def hashing_stats() -> dict:
+    with _lock:
+        result = dict(_counters)
+    result["workers"] = HASH_WORKERS
+    result["queue_size"] = HASH_QUEUE_SIZE
+    result["rounds"] = BCRYPT_ROUNDS
+    return result
+
+
+stats.register("hashing", hashing_stats)
@@ -0,0 +1,154 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from utils import stats
+
+
+# секунды; от быстрых запросов по индексу до bcrypt и медленных страниц ленты
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metrics: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, labels)} {value}" for labels, value in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._values: dict[tuple, list] = {}  # labels -> [счётчики по корзинам..., +Inf, сумма]
+
+    def observe(self, value: float, *labels) -> None:
+        # в корзину попадает только первая подходящая граница, накопительные суммы считаются при выводе
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = [(labels, list(counts)) for labels, counts in self._values.items()]
+        lines = []
+        for labels, counts in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {counts[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+def _stats_samples() -> list[str]:
+    # всё числовое из /api/stats (пул, кэши, буфер просмотров, bcrypt) - как gauge
+    lines = ["# HELP app_stat Values from /api/stats", "# TYPE app_stat gauge"]
+    for group, values in stats.collect().items():
+        for key, value in values.items():
+            if isinstance(value, (int, float)):
+                lines.append(f'app_stat{{group="{_escape(group)}",name="{_escape(key)}"}} {float(value)}')
+    return lines
+
+
+def render() -> str:
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    lines.extend(_stats_samples())
+    return "\n".join(lines) + "\n"
+
+
+# имена SQL-текстов из модулей *_queries: метка query у метрик запросов
+_query_names: dict[str, str] = {}
+
+
+def register_queries(prefix: str, queries: dict[str, object]) -> None:
+    for name, text in queries.items():
+        if isinstance(text, str) and name.isupper():
+            _query_names[text] = f"{prefix}.{name}"
+
+
+def name_query(text: str, name: str) -> None:
+    _query_names[text] = name
+
+
+def query_name(query) -> str:
+    return _query_names.get(query, "other") if isinstance(query, str) else "other"
+
+
+http_requests = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route", "status"))
+http_in_flight = Gauge("http_requests_in_flight", "HTTP requests being processed")
+db_query = Histogram("db_query_duration_seconds", "Repository query execution time", ("query",))
+db_pool_wait = Histogram("db_pool_wait_seconds", "Time spent waiting for a pool connection")
+auth_bcrypt = Histogram("auth_bcrypt_duration_seconds", "bcrypt hash/check time in the worker", ("op",))
+auth_jwt = Histogram("auth_jwt_duration_seconds", "JWT encode/decode time", ("op",),
+                     buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01))
@@ -0,0 +1,65 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+MAX_BATCH_IDS = 100
+
+
+def encode_cursor(created_at: datetime, post_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), post_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, post_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(post_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def encode_id_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([last_id]).encode()).decode().rstrip("=")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        (last_id,) = json.loads(raw)
+        if not isinstance(last_id, int):
+            raise TypeError
+        return last_id
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def next_id_cursor(rows: list[dict], limit: int) -> str | None:
+    if len(rows) < limit:
+        return None
+    return encode_id_cursor(rows[-1]["id"])
+
+
+def next_cursor(rows: list[dict], limit: int) -> str | None:
+    # неполная страница - дальше листать нечего
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last["created_at"], last["id"])
+
+
+def parse_ids(raw: str) -> list[int]:
+    """"3,1,2" -> [3, 1, 2]: порядок сохраняется, повторы убираются."""
+    try:
+        ids = list(dict.fromkeys(int(part) for part in raw.split(",") if part.strip()))
+    except ValueError:
+        raise ValueError("ids must be a comma-separated list of integers")
+    if not ids:
+        raise ValueError("ids must not be empty")
+    if any(i <= 0 for i in ids):
+        raise ValueError("ids must be positive")
+    if len(ids) > MAX_BATCH_IDS:
+        raise ValueError(f"At most {MAX_BATCH_IDS} ids per request")
+    return ids
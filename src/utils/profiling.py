@@ -0,0 +1,135 @@
+import hmac
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from contextvars import ContextVar
+
+from utils import stats
+
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")                       # пусто - заголовок и выгрузка выключены
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))   # доля запросов, профилируемых без заголовка
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+PROFILE_HEADER = b"x-profile"
+
+_lock = threading.Lock()
+# один профилируемый запрос за раз: сэмплер на каждом тике обходит стеки всех потоков
+_busy = threading.Lock()
+_profiles: dict[str, Counter] = {}
+_counters = {"profiled_requests": 0, "samples": 0, "skipped_busy": 0}
+
+# сэмплер профилируемого запроса; копируется в контекст, с которым anyio выполняет синхронный код в пуле
+current_sampler: ContextVar["Sampler | None"] = ContextVar("current_sampler", default=None)
+
+try:
+    from anyio._backends._asyncio import WorkerThread
+    WORKER_RUN = WorkerThread.run.__code__
+except (ImportError, AttributeError):
+    WORKER_RUN = None
+
+
+def authorized(token: str | None) -> bool:
+    return bool(PROFILE_TOKEN) and token is not None and hmac.compare_digest(token, PROFILE_TOKEN)
+
+
+def should_profile(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return authorized(value.decode("latin-1"))
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_qualname}"
+
+
+class Sampler(threading.Thread):
+    """Раз в interval снимает стеки потоков, занятых профилируемым запросом.
+
+    Цикл событий считается занятым, когда на его стеке кадр root_frame (вызов middleware этого запроса),
+    поток пула - когда anyio выполняет в нём код в контексте, где current_sampler - этот сэмплер.
+    """
+
+    def __init__(self, interval: float, root_frame=None, on_finish=None):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.root_frame = root_frame
+        self.on_finish = on_finish
+        self.route = "unmatched"
+        self.samples = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        try:
+            while not self._done.wait(self.interval):
+                self.sample()
+        finally:
+            if self.on_finish is not None:
+                self.on_finish(self)
+
+    def sample(self):
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+            stack = []
+            ours = False
+            while frame is not None:
+                stack.append(frame_name(frame))
+                ours = ours or frame is self.root_frame or self._runs_our_context(frame)
+                frame = frame.f_back
+            if ours:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def _runs_our_context(self, frame) -> bool:
+        if WORKER_RUN is None or frame.f_code is not WORKER_RUN:
+            return False
+        context = frame.f_locals.get("context")
+        return context is not None and context.get(current_sampler) is self
+
+    def stop(self, route: str) -> None:
+        """Не ждёт потока: вызывается из цикла событий, итог запишет сам сэмплер."""
+        self.route = route
+        self._done.set()
+
+
+def start(root_frame) -> Sampler | None:
+    if not _busy.acquire(blocking=False):
+        _counters["skipped_busy"] += 1
+        return None
+    sampler = Sampler(PROFILE_INTERVAL_MS / 1000, root_frame, on_finish=_finish)
+    sampler.start()
+    return sampler
+
+
+def _finish(sampler: Sampler) -> None:
+    with _lock:
+        _profiles.setdefault(sampler.route, Counter()).update(sampler.samples)
+        _counters["profiled_requests"] += 1
+        _counters["samples"] += sum(sampler.samples.values())
+    _busy.release()
+
+
+def collapsed(route: str | None = None) -> str:
+    """Свёрнутые стеки ("a;b;c 42") для flamegraph.pl / speedscope; без route - все маршруты, маршрут корнем."""
+    with _lock:
+        if route is not None:
+            items = _profiles.get(route, Counter()).items()
+        else:
+            items = [(f"{r};{stack}", n) for r, samples in _profiles.items() for stack, n in samples.items()]
+        lines = [f"{stack} {n}" for stack, n in sorted(items, key=lambda item: -item[1])]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def reset() -> None:
+    with _lock:
+        _profiles.clear()
+
+
+def profiling_stats() -> dict:
+    with _lock:
+        return {**_counters, "routes": len(_profiles), "sample_rate": PROFILE_SAMPLE_RATE}
+
+
+stats.register("profiling", profiling_stats)
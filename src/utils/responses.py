@@ -0,0 +1,18 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class TrustedJSONResponse(ORJSONResponse):
+    """Ответ из уже подготовленных строк репозитория.
+
+    Возвращённый из обработчика Response FastAPI не валидирует повторно по response_model,
+    а response_model по-прежнему описывает схему в OpenAPI. Поэтому сюда передаются только
+    строки ровно той формы, что описана в DTO.
+    """
+
+    def render(self, content: Any) -> bytes:
+        # OPT_UTC_Z: datetime в UTC как "...Z", как это делает pydantic
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
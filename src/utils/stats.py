@@ -0,0 +1,12 @@
+from typing import Callable
+
+
+_collectors: dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, collector: Callable[[], dict]) -> None:
+    _collectors[name] = collector
+
+
+def collect() -> dict:
+    return {name: collector() for name, collector in _collectors.items()}
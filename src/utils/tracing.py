@@ -0,0 +1,131 @@
+import logging
+import os
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+from utils import stats
+
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))                   # 0 - не логировать
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0.1"))  # доля медленных SELECT с EXPLAIN
+# EXPLAIN ANALYZE выполняет запрос заново: ограничиваем его, чтобы не занять соединение надолго
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", str(int(SLOW_QUERY_MS * 5))))
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+_counters = {"slow_queries": 0, "explains": 0, "explains_skipped": 0, "explain_errors": 0}
+# EXPLAIN ANALYZE повторно выполняет запрос: в отдельном потоке и на своём соединении, не в запросе клиента
+_explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+# не больше одного EXPLAIN в работе или в очереди: под нагрузкой остальные пропускаются
+_explain_slot = threading.Semaphore(1)
+
+
+class RequestTrace:
+    __slots__ = ("queries", "db_seconds", "pool_wait_seconds", "slowest_name", "slowest_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.slowest_name = ""
+        self.slowest_seconds = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        parts = [
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries"',
+            f"pool;dur={self.pool_wait_seconds * 1000:.2f}",
+        ]
+        if self.queries:
+            parts.append(f'slowest;dur={self.slowest_seconds * 1000:.2f};desc="{self.slowest_name}"')
+        parts.append(f"app;dur={total_seconds * 1000:.2f}")
+        return ", ".join(parts)
+
+
+current_trace: ContextVar[RequestTrace | None] = ContextVar("current_trace", default=None)
+
+
+def caller_name(depth: int = 2) -> str:
+    """Функция репозитория, вызвавшая cursor.execute: "post_repository.get_all_posts"."""
+    frame = sys._getframe(depth)
+    module = frame.f_globals.get("__name__", "")
+    return f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+
+
+def is_read(query: str) -> bool:
+    words = " ".join(query.split()).upper()
+    return words.startswith(("SELECT", "WITH")) and not any(
+        verb in words for verb in ("INSERT ", "UPDATE ", "DELETE ")
+    )
+
+
+def record_pool_wait(seconds: float) -> None:
+    trace = current_trace.get()
+    if trace is not None:
+        trace.pool_wait_seconds += seconds
+
+
+def record_query(name: str, query, params, seconds: float) -> None:
+    trace = current_trace.get()
+    if trace is not None:
+        trace.queries += 1
+        trace.db_seconds += seconds
+        if seconds > trace.slowest_seconds:
+            trace.slowest_seconds = seconds
+            trace.slowest_name = name
+
+    if SLOW_QUERY_MS and seconds * 1000 >= SLOW_QUERY_MS and isinstance(query, str):
+        _slow_query(name, query, params, seconds)
+
+
+def loggable_params(query: str, params) -> str:
+    # хэши паролей (CREATE_USER, update_user) в лог не пишем - только типы параметров
+    if params is not None and "password_hash" in query.lower():
+        values = params.values() if isinstance(params, dict) else params
+        return "<redacted: " + ", ".join(type(value).__name__ for value in values) + ">"
+    return f"{params!r:.500}"
+
+
+def _slow_query(name: str, query: str, params, seconds: float) -> None:
+    _counters["slow_queries"] += 1
+    shape = " ".join(query.split())
+    logger.warning(
+        "Slow query %s: %.1f ms\n%s\nparams: %s", name, seconds * 1000, shape, loggable_params(query, params)
+    )
+    if is_read(query) and random.random() < SLOW_QUERY_EXPLAIN_RATE:
+        if not _explain_slot.acquire(blocking=False):
+            _counters["explains_skipped"] += 1
+            return
+        try:
+            _explainer.submit(_explain, name, query, params)
+        except RuntimeError:
+            # пул уже остановлен при завершении процесса
+            _explain_slot.release()
+
+
+def _explain(name: str, query: str, params) -> None:
+    import psycopg
+
+    from config.db import conninfo
+
+    try:
+        options = f"-c statement_timeout={SLOW_QUERY_EXPLAIN_TIMEOUT_MS}"
+        with psycopg.connect(conninfo, autocommit=True, options=options) as conn:
+            rows = conn.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params).fetchall()
+        _counters["explains"] += 1
+        logger.warning("Plan of slow query %s:\n%s", name, "\n".join(row[0] for row in rows))
+    except Exception:
+        _counters["explain_errors"] += 1
+        logger.exception("EXPLAIN of slow query %s failed", name)
+    finally:
+        _explain_slot.release()
+
+
+def tracing_stats() -> dict:
+    return {**_counters, "slow_query_ms": SLOW_QUERY_MS, "explain_rate": SLOW_QUERY_EXPLAIN_RATE}
+
+
+stats.register("tracing", tracing_stats)